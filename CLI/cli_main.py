@@ -8,7 +8,7 @@ import os
 import traceback
 
 from CLI.model.player import Player
-from scores_api import ScoreAPI
+from scores_api import CLI_OUTBOX_PATH, get_score_api
 
 scores_file = "scores_CLI.json"
 
@@ -48,7 +48,7 @@ class Game:
         """Retrieve high scores from API with fallback to local file"""
         try:
             # Try API first
-            api = ScoreAPI()
+            api = get_score_api(outbox_path=CLI_OUTBOX_PATH)
             try:
                 scores = api.get_cli_scores()
                 if scores:
@@ -72,7 +72,7 @@ class Game:
             return []
 
     def view_high_scores(self):
-        score_api = ScoreAPI()
+        score_api = get_score_api(outbox_path=CLI_OUTBOX_PATH)
 
         try:
             # Try API first
@@ -132,7 +132,7 @@ class Game:
                 avg_time = round(avg_time, 2)
 
             # First try to save to API
-            api = ScoreAPI()
+            api = get_score_api(outbox_path=CLI_OUTBOX_PATH)
             api_success = api.save_cli_score(
                 name=player_name,
                 score=score,
@@ -286,13 +286,31 @@ class Game:
             print("\n\nJeu terminé par l'utilisateur.")
 
 
+def print_scores_table(scores):
+    print("\n╔═════════════════════════════════════════════════════════════════════╗")
+    print("║                           MEILLEURS SCORES                          ║")
+    print("╠═══════╦═══════════════════╦════════╦════════════╦═══════════════════╣")
+    print("║ Rang  ║ Joueur            ║ Score  ║ Lettres    ║ Temps moyen (s)   ║")
+    print("╠═══════╬═══════════════════╬════════╬════════════╬═══════════════════╣")
+
+    for i, score_data in enumerate(scores):
+        name = score_data.get("name", "Anonyme")
+        score = score_data.get("score", 0)
+        letters = score_data.get("letters", 0)
+        avg_time = score_data.get("avg_time", 0)
+        print(f"║ {i + 1:<5} ║ {name[:17]:<17} ║ {score:<6} ║ {letters:<10} ║ {avg_time:<17} ║")
+
+    print("╚═══════╩═══════════════════╩════════╩════════════╩═══════════════════╝\n")
+
+
 def view_high_scores():
-    score_api = ScoreAPI()
+    score_api = get_score_api(outbox_path=CLI_OUTBOX_PATH)
+    updates = []
 
     try:
-        # Try API first
+        # Try API first, the cached leaderboard is shown at once and revalidated in the background
         try:
-            scores = score_api.get_cli_scores()
+            scores = score_api.get_cli_scores(on_update=lambda scores, fresh: updates.append((scores, fresh)))
             print("Scores retrieved from API")
         except Exception as e:
             print(f"Could not retrieve scores from API: {e}")
@@ -306,20 +324,18 @@ def view_high_scores():
             print("Aucun score enregistré pour le moment.")
             return
 
-        print("\n╔═════════════════════════════════════════════════════════════════════╗")
-        print("║                           MEILLEURS SCORES                          ║")
-        print("╠═══════╦═══════════════════╦════════╦════════════╦═══════════════════╣")
-        print("║ Rang  ║ Joueur            ║ Score  ║ Lettres    ║ Temps moyen (s)   ║")
-        print("╠═══════╬═══════════════════╬════════╬════════════╬═══════════════════╣")
-
-        for i, score_data in enumerate(scores):
-            name = score_data.get("name", "Anonyme")
-            score = score_data.get("score", 0)
-            letters = score_data.get("letters", 0)
-            avg_time = score_data.get("avg_time", 0)
-            print(f"║ {i + 1:<5} ║ {name[:17]:<17} ║ {score:<6} ║ {letters:<10} ║ {avg_time:<17} ║")
+        print_scores_table(scores)
 
-        print("╚═══════╩═══════════════════╩════════╩════════════╩═══════════════════╝\n")
+        status = score_api.leaderboard_status('cli')
+        if status['revalidating']:
+            print(f"Classement en cache depuis {int(status['age'] // 60)} min, mise à jour...")
+            score_api.wait_for_revalidation('cli', timeout=15)
+            if updates and updates[-1][1] and updates[-1][0] != scores:
+                print_scores_table(updates[-1][0])
+            elif updates and updates[-1][1]:
+                print("Le classement est à jour.")
+            else:
+                print("Mise à jour impossible, classement en cache affiché.")
     except FileNotFoundError:
         print("Aucun score enregistré. Soyez le premier à établir un record!")
     except json.JSONDecodeError:
@@ -339,10 +355,11 @@ def main():
         view_high_scores()
     elif args.command == 'sync':
         print("Synchronisation des scores locaux avec le serveur...")
-        score_api = ScoreAPI()
+        score_api = get_score_api(outbox_path=CLI_OUTBOX_PATH)
         try:
-            score_api.sync_local_scores()
-            print("Synchronisation terminée!")
+            results = score_api.sync_local_scores()
+            print(f"Synchronisation terminée! {results['sent']} score(s) envoyé(s), "
+                  f"{results['rejected']} refusé(s), {results['remaining']} en attente.")
         except Exception as e:
             print(f"Erreur lors de la synchronisation: {e}")
 
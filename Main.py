@@ -3,211 +3,145 @@ import time
 
 import pygame
 import random
-import threading
 import json
 import math
 
 import pygame.transform
-from model.Difficulty import Difficulty
 from model.DifficultySelector import DifficultySelector
 from model.Slider import Slider
-from model.Background import Background
-from model.Lava import Lava
-from model.Player import Player
-from model.Obstacle import Obstacle
 from model.Settings import Settings
 from model.InputBox import  InputBox
-from scores_api import ScoreAPI
+from model.TextRenderer import text_renderer
+from model.ScreenLayer import ScreenLayer
+from model.DirtyRects import DirtyRects
+from model.AssetManager import assets
+from model.ObstacleAtlas import obstacle_atlas
+from model.FrameProfiler import FrameProfiler
+from model.Hud import Hud
+from model.AnimationPool import AnimationPool
+from model.AudioService import AudioService, PRIORITY_HIGH
+from model.SoundBank import SoundBank
+from model.ScoreSubmitter import ScoreSubmitter, SCORES_UPDATED
+from model.Simulation import Simulation, BLACK_SQUARE_SPAWN_RATE, SIMULATION_RATE
+from scores_api import get_score_api
 
 os.environ['SDL_VIDEO_CENTERED'] = '1'
 
-# Keys
-AVAILABLE_KEYS = ["A", "S", "D", "W", "Z", "Q", "E", "R", "T", "Y", "U", "I", "O", "P", "F", "G", "H", "J", "K", "L", "X", "C", "V", "B", "N", "M"]
 MAX_ROCK_IMG = 4
-TAUX_PIEGES = 0.2
-NB_VIES = 4
-MAX_BLACK_SQUARES = 20  # Decreased from 30
-MAX_OBSTACLES = 20  # Set the maximum number of obstacles
-BLACK_SQUARE_SPAWN_RATE = 20  # Increased from 10
-LAVA_SPEED = 0.5
-
-pygame.init()
-
-screen_info = pygame.display.Info()
-WIDTH, HEIGHT = screen_info.current_w, screen_info.current_h
-
-screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.NOFRAME)
-pygame.display.set_caption("KeyScale")
-
-screen_rect = screen.get_rect()
-screen_center = (pygame.display.Info().current_w // 2 - screen_rect.width // 2,
-                 pygame.display.Info().current_h // 2 - screen_rect.height // 2)
-os.environ['SDL_VIDEO_WINDOW_POS'] = f"{screen_center[0]},{screen_center[1]}"
+# Push only the changed regions of the game screen instead of flipping it whole
+DIRTY_RECTS = os.environ.get('KEYSCALE_DIRTY_RECTS', '0') == '1'
+
+MAX_STEPS_PER_FRAME = 5  # Avoid spiralling when a frame takes far too long
+# Frames drawn per second, 0 means uncapped
+RENDER_FPS = int(os.environ.get('KEYSCALE_FPS', '45'))
+# Per-phase frame timings, also toggled in game with F3
+PROFILE = os.environ.get('KEYSCALE_PROFILE', '0') == '1'
+PROFILE_CSV = os.environ.get('KEYSCALE_PROFILE_CSV', 'frame_profile.csv')
+# Decode death animations while they play, holding at most ANIMATION_BUFFER frames in memory
+STREAM_ANIMATIONS = os.environ.get('KEYSCALE_STREAM_ANIMATIONS', '0') == '1'
+ANIMATION_BUFFER = int(os.environ.get('KEYSCALE_ANIMATION_BUFFER', '8'))
+# Frame, alpha and loop counters drawn over the death animations
+ANIMATION_DEBUG = os.environ.get('KEYSCALE_ANIMATION_DEBUG', '0') == '1'
+# Worker processes decoding the death animations, 0 decodes them in a thread of the game
+DECODE_PROCESSES = int(os.environ.get('KEYSCALE_DECODE_PROCESSES', '0'))
+DEATH_ANIMATIONS = ['rock_loose.gif', 'lavaloose.gif']
 
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
 RED = (255, 0, 0)
 
+FONT_SIZE = 36
 
-font = pygame.font.Font(None, 36)
+# Set by init_display(), importing this module opens no window
+WIDTH, HEIGHT = 0, 0
+screen = None
+font = None
 
-# Load sounds
-wrong_key_sound = pygame.mixer.Sound('./ressources/wrong_key.mp3')
-faster_sound = pygame.mixer.Sound('./ressources/faster.wav')
+def init_display():
+    """Open the window, then load the font the menus need"""
+    global WIDTH, HEIGHT, screen, font
+    pygame.init()
 
-# Thread for music
-def play_music():
-    pygame.mixer.music.load('./ressources/musique.mp3')
-    pygame.mixer.music.play(-1)
+    screen_info = pygame.display.Info()
+    WIDTH, HEIGHT = screen_info.current_w, screen_info.current_h
 
-music_thread = threading.Thread(target=play_music)
-music_thread.start()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.NOFRAME)
+    pygame.display.set_caption("KeyScale")
 
-def play_faster_sound():
-    faster_sound.set_volume(game.settings.settings['sound_effects_volume'])
-    faster_sound.play()
+    screen_rect = screen.get_rect()
+    screen_center = (pygame.display.Info().current_w // 2 - screen_rect.width // 2,
+                     pygame.display.Info().current_h // 2 - screen_rect.height // 2)
+    os.environ['SDL_VIDEO_WINDOW_POS'] = f"{screen_center[0]},{screen_center[1]}"
 
-def play_wrong_key_sound():
-    wrong_key_sound.set_volume(game.settings.settings['sound_effects_volume'])
-    wrong_key_sound.play()
+    font = text_renderer.get_font(FONT_SIZE)
 
 
 class Game:
+    """Menus, sound and drawing around a Simulation that owns every game rule"""
+
     def __init__(self):
         self.settings = Settings('./settings.xml')
-        self.player = Player(WIDTH, HEIGHT)
-        self.obstacles = []
-        self.score = 0
-        self.previous_score = 0
-        self.score_animation = 0
-        self.lives = NB_VIES
+        assets.preload(WIDTH, HEIGHT)
+        self.simulation = Simulation(WIDTH, HEIGHT, self.settings.settings['difficulty'],
+                                     int(self.settings.settings['square_size']))
+        self.hud = Hud()
         self.clock = pygame.time.Clock()
+        self.dirty_rects = DirtyRects(DIRTY_RECTS)
+        self.profiler = FrameProfiler(PROFILE, PROFILE_CSV, 1000 / SIMULATION_RATE)
+        self.simulation.profiler = self.profiler
+        self.sound_bank = SoundBank()
+        self.sound_bank.load()
+        self.audio = AudioService(self.sound_bank)
+        self.menu_music_history = None
+        self.next_menu_music = None
+        self.death_animations = AnimationPool(WIDTH, HEIGHT, STREAM_ANIMATIONS, ANIMATION_BUFFER,
+                                              ANIMATION_DEBUG, DECODE_PROCESSES)
         self.running = True
-        self.available_keys = AVAILABLE_KEYS.copy()
-        self.difficulty = self.load_difficulty(self.settings.settings['difficulty'])
         self.rock_image = None
-        self.game_over = False
-        self.background = Background('./ressources/background.jpg', WIDTH, HEIGHT)
         self.scores_file = './scores.json'
         self.high_scores = self.load_scores()
-        self.lava = Lava(WIDTH, HEIGHT, self.difficulty.lava_speed, "./ressources/lava.jpg")
+        self.scores_version = 0
+        self.scores_note = None  # Shown under the leaderboard when it may be out of date or the score was not sent
+        # Static layers of the menu screens, rebuilt only when their content changes
+        self.menu_layer = ScreenLayer((WIDTH, HEIGHT))
+        self.settings_layer = ScreenLayer((WIDTH, HEIGHT))
+        self.game_over_layer = ScreenLayer((WIDTH, HEIGHT))
+        self.is_new_best_score = False
         self.apply_settings()
-        self.spawn_rate = self.get_initial_spawn_rate()
-        self.background_image = pygame.image.load('./ressources/menu.jpg')
-        self.background_image = pygame.transform.scale(self.background_image, (WIDTH, HEIGHT))
+        self.background_image = assets.image('./ressources/menu.jpg', (WIDTH, HEIGHT))
         self.player_name = "Anonymous"  # Default player name
-        self.score_api = ScoreAPI("https://keyscale.lzonca.fr/api")
+        self.score_api = get_score_api("https://keyscale.lzonca.fr/api")
+        # Scores go to the server in the background, the leaderboard comes back as SCORES_UPDATED events
+        self.score_submitter = ScoreSubmitter(self.score_api, self.scores_file)
+        self.score_submitter.refresh()
         try:
-            icon = pygame.image.load('./ressources/menu.jpg')
-            pygame.display.set_icon(icon)
+            pygame.display.set_icon(self.background_image)
         except Exception as e:
             print(f"Error loading application icon: {e}")
 
-    def play_menu_music(self):
-        pygame.mixer.music.stop()
-
-        menu_music_options = ['./ressources/menu_musique1.mp3', './ressources/menu_musique2.mp3']
+    def choose_menu_music(self):
+        """Pick a menu track, never the one heard last time"""
+        menu_music_options = self.sound_bank.ids('menu_music')
 
         if self.menu_music_history in menu_music_options and len(menu_music_options) > 1:
             menu_music_options.remove(self.menu_music_history)
 
-        selected_music = random.choice(menu_music_options)
-        self.menu_music_history = selected_music
-
-        pygame.mixer.music.load(selected_music)
-        pygame.mixer.music.set_volume(self.settings.settings['menu_music_volume'])
-        pygame.mixer.music.play(-1)
-
-    def draw_hud(self, screen):
-
-        circle_radius = 15
-        circle_spacing = 40
-        start_x = 20
-        start_y = 20
-
-
-        for i in range(NB_VIES):
-            circle_x = start_x + (i * circle_spacing) + circle_radius
-            circle_y = start_y + circle_radius
-
-            if i < self.lives:
-                gradient_color = (255, 100, 100)
-                pygame.draw.circle(screen, gradient_color, (circle_x, circle_y), circle_radius)
-                pygame.draw.circle(screen, (255, 150, 150), (circle_x - 3, circle_y - 3), circle_radius - 5)
-            else:
-                pygame.draw.circle(screen, (100, 100, 100), (circle_x, circle_y), circle_radius, 2)
-
-        if not hasattr(self, 'previous_score'):
-            self.previous_score = 0
-            self.score_animation = 0
-
-        if self.score > self.previous_score:
-            self.score_animation = 10
-            self.previous_score = self.score
-
-        score_size = 48 + self.score_animation
-
-        if self.score_animation > 0:
-            self.score_animation -= 0.5
-
-        score_font = pygame.font.Font(None, int(score_size))
-
-        score_bg_width = 200
-        score_bg_height = 60
-        score_bg_rect = pygame.Rect(
-            WIDTH - score_bg_width - 10,
-            10,
-            score_bg_width,
-            score_bg_height
-        )
-
+        return random.choice(menu_music_options)
 
-        score_bg = pygame.Surface((score_bg_width, score_bg_height), pygame.SRCALPHA)
-        score_bg.fill((0, 0, 0, 100))
-        screen.blit(score_bg, score_bg_rect)
-
-        if self.score < 100:
-            score_color = (255, 255, 255)
-        elif self.score < 500:
-            score_color = (255, 255, 0)
-        elif self.score < 1000:
-            score_color = (255, 165, 0)
-        else:
-            score_color = (255, 215, 0)
-
-        if self.score_animation > 0:
-            pulse = (math.sin(pygame.time.get_ticks() * 0.01) + 1) * 0.5
-            glow_intensity = int(100 * pulse)
-
-            if score_color[0] > 200:
-                glow_color = (200, 200, 255)
-            else:
-                glow_color = (255, 255, 255)
-
-
-            for offset in range(3, 0, -1):
-                glow_text = score_font.render(f"Score: {self.score}", True, glow_color)
-                screen.blit(glow_text, (WIDTH - glow_text.get_width() - 20 + offset, 20 + offset))
-
-
-        score_text = score_font.render(f"Score: {self.score}", True, score_color)
-
-
-        shadow_text = score_font.render(f"Score: {self.score}", True, (0, 0, 0))
-        screen.blit(shadow_text, (WIDTH - score_text.get_width() - 19, 21))
-
-
-        screen.blit(score_text, (WIDTH - score_text.get_width() - 20, 20))
+    def play_menu_music(self):
+        # Picked and loaded while the game music played
+        selected_music = self.next_menu_music or self.choose_menu_music()
+        self.next_menu_music = None
+        self.menu_music_history = selected_music
 
-    def play_sound_effect(self, sound):
-        sound.set_volume(self.settings.settings['sound_effects_volume'])
-        sound.play()
+        self.audio.music(selected_music)
+        # The next transition is the start of a game
+        self.audio.prefetch_music('musique')
 
     def play_game_music(self):
-        pygame.mixer.music.stop()
-        pygame.mixer.music.load('./ressources/musique.mp3')
-        pygame.mixer.music.set_volume(self.settings.settings['game_music_volume'])
-        pygame.mixer.music.play(-1)
+        self.audio.music('musique')
+        self.next_menu_music = self.choose_menu_music()
+        self.audio.prefetch_music(self.next_menu_music)
 
     def get_player_name(self):
         input_box = InputBox(WIDTH // 2 - 100, HEIGHT // 2, 200, 32, font)
@@ -222,13 +156,11 @@ class Game:
             screen.blit(self.background_image, (0, 0))
             screen.blit(overlay, (0, 0))
 
-            prompt_text = font.render("Saisissez votre nom:", True, WHITE)
-            screen.blit(prompt_text, (WIDTH // 2 - prompt_text.get_width() // 2, HEIGHT // 2 - 50))
-
-            instruction_text = font.render("(Apuyer sur ENTRÉE pour valider)", True, WHITE)
-            screen.blit(instruction_text, (WIDTH // 2 - instruction_text.get_width() // 2, HEIGHT // 2 + 40))
+            text_renderer.draw_centered(screen, "Saisissez votre nom:", FONT_SIZE, WHITE, WIDTH // 2, HEIGHT // 2 - 50)
+            text_renderer.draw_centered(screen, "(Apuyer sur ENTRÉE pour valider)", FONT_SIZE, WHITE,
+                                        WIDTH // 2, HEIGHT // 2 + 40)
 
-            for event in pygame.event.get():
+            for event in pygame.event.get(exclude=SCORES_UPDATED):
                 if event.type == pygame.QUIT:
                     self.running = False
                     return "Annonyme"
@@ -246,127 +178,30 @@ class Game:
         return input_box.text if input_box.text and input_box.text.strip() else "Annonyme"
 
     def update_high_scores(self):
-        try:
-
-            if self.score > 0:
-                api_success = self.score_api.save_game_score(
-                    name=self.player_name,
-                    score=self.score,
-                    difficulty=self.settings.settings['difficulty']
-                )
-
-                if api_success:
-                    try:
-                        self.high_scores = self.score_api.get_game_scores()
-                        print("Scores successfully retrieved from API")
-                        return self.high_scores
-                    except Exception as e:
-                        print(f"Couldn't retrieve scores from API: {e}")
-
-
-            if not os.path.exists(self.scores_file):
-                with open(self.scores_file, 'w') as file:
-                    json.dump([], file)
-
-            with open(self.scores_file, 'r') as file:
-                scores = json.load(file)
-
-            if self.score > 0:
-                new_entry = {
-                    "name": self.player_name,
-                    "score": self.score,
-                    "difficulty": self.settings.settings['difficulty']
-                }
-                scores.append(new_entry)
-
-                scores.sort(key=lambda x: x["score"] if isinstance(x, dict) else 0, reverse=True)
-
-                scores = scores[:10]
-
-                with open(self.scores_file, 'w') as file:
-                    json.dump(scores, file)
-
-            self.high_scores = scores
-            return scores
-        except Exception as e:
-            print(f"Error updating high scores: {e}")
-            return []
-
-    def load_scores(self):
-        try:
-            try:
-                api_scores = self.score_api.get_game_scores()
-                if api_scores:
-                    print("Scores loaded from API")
-                    return api_scores
-            except Exception as e:
-                print(f"Failed to load scores from API: {e}")
-                print("Falling back to local scores")
-
-            # Fallback to local file
-            if os.path.exists(self.scores_file):
-                with open(self.scores_file, 'r') as file:
-                    scores = json.load(file)
-                    return scores
-            return []
-        except Exception as e:
-            print(f"Error loading scores: {e}")
-            return []
-
-    def get_initial_spawn_rate(self):
-        if self.difficulty == 'facile':
-            return 70  # Increased from 50
-        elif self.difficulty == 'moyen':
-            return 50  # Increased from 30
-        elif self.difficulty == 'difficile':
-            return 30  # Increased from 20
-        else:
-            return 50  # Default value in case of an unknown difficulty
-
-    def adjust_difficulty(self):
-        # Adjust spawn rate based on score and distance to lava
-        distance_to_lava = self.player.rect.bottom - self.lava.rect.top
-        if self.score < 100:
-            self.spawn_rate = self.get_initial_spawn_rate()
-        elif self.score < 200:
-            self.spawn_rate = max(10, self.spawn_rate - 1)
+        """Queue the score of the game that just ended, the new leaderboard arrives as a SCORES_UPDATED event"""
+        if self.simulation.score > 0:
+            self.score_submitter.submit(self.player_name, self.simulation.score,
+                                        self.settings.settings['difficulty'])
+
+    def on_scores_updated(self, event):
+        self.high_scores = event.scores
+        self.scores_version += 1
+        if event.source == 'local':
+            self.scores_note = "Classement local"
+        elif event.source in ('cache', 'stale') and event.age is not None:
+            minutes = int(event.age // 60)
+            age = f"{minutes // 60} h" if minutes >= 60 else f"{minutes} min"
+            if event.source == 'stale':
+                self.scores_note = f"Classement d'il y a {age}, serveur injoignable"
+            else:
+                self.scores_note = (f"Classement d'il y a {age}, mise à jour..." if minutes
+                                    else "Classement en cours de mise à jour...")
         else:
-            self.spawn_rate = max(5, self.spawn_rate - 1)
-
-        if distance_to_lava < 100:
-            self.spawn_rate = max(5, self.spawn_rate - 2)
-
-    def load_difficulty(self, difficulty_name):
-        difficulties = {
-            'facile': Difficulty(
-                'facile',
-                obstacle_speed=2,
-                spawn_rate=50,  # Make letters appear more frequently on easy
-                lava_speed_increment=0.03,
-                lava_start_delay=10.0,  # 8 seconds delay before lava starts moving
-                initial_obstacles=10,  # Spawn 10 obstacles at the start
-                lava_speed=0.3  # Slower lava speed for easy difficulty
-            ),
-            'moyen': Difficulty(
-                'moyen',
-                obstacle_speed=4,
-                spawn_rate=50,
-                lava_speed_increment=0.07,
-                lava_start_delay=5.0,  # 5 seconds delay
-                initial_obstacles=8,
-                lava_speed=0.5  # Medium lava speed
-            ),
-            'difficile': Difficulty(
-                'difficile',
-                obstacle_speed=6,
-                spawn_rate=30,
-                lava_speed_increment=0.15,
-                lava_start_delay=2.0,  # 2 seconds delay
-                initial_obstacles=5,
-                lava_speed=0.8  # Faster lava speed for hard difficulty
-            )
-        }
-        return difficulties.get(difficulty_name, difficulties['moyen'])
+            self.scores_note = None
+        if event.submitted is False:
+            # Queued in the outbox, it is sent again later
+            saved = "Score enregistré localement"
+            self.scores_note = f"{saved} - {self.scores_note}" if self.scores_note else saved
 
     def apply_settings(self):
         """Apply settings from the settings object"""
@@ -376,26 +211,26 @@ class Game:
         else:
             self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
 
+        # Settings changed, so every cached screen has to be composited again
+        for layer in (self.menu_layer, self.settings_layer, self.game_over_layer):
+            layer.invalidate()
+
         # Apply font size to obstacles text
-        global obstacle_font
-        obstacle_font = pygame.font.Font(None, int(self.settings.settings['font_size']))
+        self.font_size = int(self.settings.settings['font_size'])
 
         # Apply square size to obstacles
-        self.obstacle_size = int(self.settings.settings['square_size'])
+        self.simulation.obstacle_size = int(self.settings.settings['square_size'])
+
+        # Obstacle tiles are only rendered again when one of their sizes changed
+        obstacle_atlas.configure(self.simulation.obstacle_size, self.font_size)
 
         # Apply spawn rate from settings
-        self.spawn_rate = int(self.settings.settings.get('spawn_rate', BLACK_SQUARE_SPAWN_RATE))
-
-        # Apply correct volume based on what's currently playing
-        if pygame.mixer.music.get_busy():
-            # Check if we're in menu or game
-            if hasattr(self, 'menu_music_history') and self.menu_music_history and \
-                    ('menu_musique' in self.menu_music_history):
-                # Menu music is playing
-                pygame.mixer.music.set_volume(self.settings.settings['menu_music_volume'])
-            else:
-                # Game music is playing
-                pygame.mixer.music.set_volume(self.settings.settings['game_music_volume'])
+        self.simulation.spawn_rate = int(self.settings.settings.get('spawn_rate', BLACK_SQUARE_SPAWN_RATE))
+
+        # The audio service applies each volume to whatever of its group is playing
+        self.audio.set_group_volume('menu_music', self.settings.settings['menu_music_volume'])
+        self.audio.set_group_volume('game_music', self.settings.settings['game_music_volume'])
+        self.audio.set_group_volume('effects', self.settings.settings['sound_effects_volume'])
 
     def load_scores(self):
         """Load scores from file with difficulty migration"""
@@ -438,14 +273,13 @@ class Game:
                                                  self.settings.settings['difficulty'])
 
         while menu_running:
-            screen.blit(self.background_image, (0, 0))  # Draw the background image
-            title_text = font.render("Menu Principal", True, BLACK)
-            start_text = font.render("Appuyez sur S pour Commencer", True, BLACK)
-            quit_text = font.render("Appuyez sur Q pour Quitter", True, BLACK)
-            settings_text = font.render("Appuyez sur T pour les Paramètres", True, BLACK)
+            title_text = text_renderer.render("Menu Principal", FONT_SIZE, BLACK)
+            start_text = text_renderer.render("Appuyez sur S pour Commencer", FONT_SIZE, BLACK)
+            quit_text = text_renderer.render("Appuyez sur Q pour Quitter", FONT_SIZE, BLACK)
+            settings_text = text_renderer.render("Appuyez sur T pour les Paramètres", FONT_SIZE, BLACK)
 
-            player_text = font.render(f"Joueur: {self.player_name}", True, BLACK)
-            change_name_text = font.render("Appuyez sur N pour Changer le Nom", True, BLACK)
+            player_text = text_renderer.render(f"Joueur: {self.player_name}", FONT_SIZE, BLACK)
+            change_name_text = text_renderer.render("Appuyez sur N pour Changer le Nom", FONT_SIZE, BLACK)
 
             title_x = WIDTH // 2 - title_text.get_width() // 2
             title_y = HEIGHT // 2 - 200
@@ -460,26 +294,29 @@ class Game:
             change_name_x = WIDTH // 2 - change_name_text.get_width() // 2
             change_name_y = HEIGHT // 2 - 50
 
-            def draw_text_with_border(text, x, y):
-                border_color = (255, 255, 255)  # White border color
-                screen.blit(font.render(text, True, border_color), (x - 2, y - 2))
-                screen.blit(font.render(text, True, border_color), (x + 2, y - 2))
-                screen.blit(font.render(text, True, border_color), (x - 2, y + 2))
-                screen.blit(font.render(text, True, border_color), (x + 2, y + 2))
-                screen.blit(font.render(text, True, BLACK), (x, y))  # Main text
-
-            draw_text_with_border("Menu Principal", title_x, title_y)
-            draw_text_with_border(f"Joueur: {self.player_name}", player_x, player_y)
-            draw_text_with_border("Appuyez sur N pour Changer le Nom", change_name_x, change_name_y)
-            draw_text_with_border("Appuyez sur S pour Commencer", start_x, start_y)
-            draw_text_with_border("Appuyez sur Q pour Quitter", quit_x, quit_y)
-            draw_text_with_border("Appuyez sur T pour les Paramètres", settings_x, settings_y)
+            def draw_static(surface):
+                surface.blit(self.background_image, (0, 0))  # Draw the background image
+
+                def draw_text_with_border(text, x, y):
+                    text_renderer.draw(surface, text, FONT_SIZE, BLACK, (x, y), outline=WHITE)
+
+                draw_text_with_border("Menu Principal", title_x, title_y)
+                draw_text_with_border(f"Joueur: {self.player_name}", player_x, player_y)
+                draw_text_with_border("Appuyez sur N pour Changer le Nom", change_name_x, change_name_y)
+                draw_text_with_border("Appuyez sur S pour Commencer", start_x, start_y)
+                draw_text_with_border("Appuyez sur Q pour Quitter", quit_x, quit_y)
+                draw_text_with_border("Appuyez sur T pour les Paramètres", settings_x, settings_y)
 
+            self.menu_layer.draw(screen, (self.player_name,), draw_static)
+
+            # Only the selected difficulty changes between frames
             difficulty_selector.draw(screen)
 
             pygame.display.flip()
+            self.clock.tick(30)
 
-            for event in pygame.event.get():
+            # Score results stay queued for the game loop
+            for event in pygame.event.get(exclude=SCORES_UPDATED):
                 if event.type == pygame.QUIT:
                     self.running = False
                     menu_running = False
@@ -520,181 +357,47 @@ class Game:
                         1] <= change_name_y + change_name_text.get_height():
                         self.player_name = self.get_player_name()
 
-    def adjust_lava_speed(self):
-        base_lava_speed = 0.5
-        score_factor = self.score / 100
-
-        difficulty_multiplier = self.difficulty.lava_speed_increment
-
-        new_speed = base_lava_speed + (score_factor * difficulty_multiplier)
-
-        max_speed = 3.0
-        new_speed = min(new_speed, max_speed)
-
-        # Update lava speed
-        self.lava.speed = new_speed
-
-    def generate_obstacle(self):
-        if len(self.obstacles) >= MAX_OBSTACLES:
-            return
-
-
-        current_traps = sum(1 for obs in self.obstacles if obs.is_trap)
-        current_regular = sum(1 for obs in self.obstacles if not obs.is_trap)
-
-
-        force_regular = current_regular < 5 or current_traps > current_regular * 2
-
-
-        is_trap = random.random() < TAUX_PIEGES and not force_regular
-
-
-        if is_trap and current_traps >= MAX_OBSTACLES // 3:
-            is_trap = False
-        elif not is_trap and current_regular >= MAX_BLACK_SQUARES:
-            return
-
-
-        if is_trap:
-            available_keys = [key for key in self.available_keys
-                              if key not in [obs.key for obs in self.obstacles]]
-        else:
-            available_keys = [key for key in self.available_keys
-                              if key not in [obs.key for obs in self.obstacles]]
-
-        if not available_keys:
-
-            self.available_keys = AVAILABLE_KEYS.copy()
-            available_keys = self.available_keys
-
-
-        key = random.choice(available_keys)
-        self.available_keys.remove(key)
-        self.obstacles.append(Obstacle(WIDTH, is_trap, key,
-                                       self.obstacle_size, self.difficulty.obstacle_speed))
-
-    def create_tutorial(self):
-        tutorial_word = "APPUYER!"
-        letter_width = self.obstacle_size
-        total_width = len(tutorial_word) * letter_width * 1.5  # 1.5 for spacing
-        start_x = (WIDTH - total_width) // 2
-
-        for i, letter in enumerate(tutorial_word):
-            obstacle = Obstacle(WIDTH, False, letter, self.obstacle_size, 0)
-            obstacle.pos = [start_x + i * letter_width * 1.5, HEIGHT // 3]
-            obstacle.tutorial = True
-            self.tutorial_letters.append(obstacle)
-
-    def handle_tutorial_key_press(self, key):
-        for obstacle in self.tutorial_letters[:]:
-            if key == obstacle.key:
-                self.tutorial_letters.remove(obstacle)
-
-                self.player.climb()
-
-                if not self.tutorial_letters:
-                    self.tutorial_completed = True
-                    self.countdown_start_time = pygame.time.get_ticks()
-                    self.countdown_active = True
-                return
-
     def draw_countdown(self, screen):
-        if not self.countdown_active:
+        if not self.simulation.countdown_active:
             return
 
-        elapsed = (pygame.time.get_ticks() - self.countdown_start_time) // 1000
-        remaining = 3 - elapsed
-
-        if remaining <= 0:
-            self.countdown_active = False
-            self.tutorial_active = False
-            return
-
-        countdown_font = pygame.font.Font(None, 150)
-        countdown_text = countdown_font.render(str(remaining), True, RED)
+        remaining = math.ceil(self.simulation.countdown_remaining)
+        countdown_text = text_renderer.render(str(remaining), 150, RED)
 
         screen.blit(countdown_text,
                     (WIDTH // 2 - countdown_text.get_width() // 2,
-                     self.player.rect.bottom + 100))
+                     self.simulation.player.rect.bottom + 100))
 
     def reset_game(self):
         self.update_high_scores()
-        self.player = Player(WIDTH, HEIGHT)
-        self.obstacles.clear()
-        self.score = 0
-        self.previous_score = 0
-        self.lives = NB_VIES
-        self.available_keys = AVAILABLE_KEYS.copy()
+        self.dirty_rects.request_full()
+        self.reset_clock()
+        self.simulation.reset(self.settings.settings['difficulty'])
+        self.hud.reset()
         self.rock_image = None
         self.rock_display_time = 0
-        self.game_over = False
         self.death_animation = None
-
-        self.tutorial_active = True
-        self.tutorial_letters = []
-        self.tutorial_completed = False
-        self.countdown_start_time = 0
-        self.countdown_active = False
-
-        self.difficulty = self.load_difficulty(self.settings.settings['difficulty'])
-        self.spawn_rate = self.get_initial_spawn_rate()
-
-        self.lava = Lava(WIDTH, HEIGHT, self.difficulty.lava_speed, "./ressources/lava.jpg")
-        self.lava.set_start_delay(self.difficulty.lava_start_delay)
-
-        self.create_tutorial()
+        # Get both death animations ready while the player goes through the tutorial
+        self.death_animations.warm(DEATH_ANIMATIONS)
 
         if not hasattr(self, 'menu_music_history'):
             self.menu_music_history = None
 
-    def spawn_initial_obstacles(self):
-        for _ in range(self.difficulty.initial_obstacles):
-            self.generate_obstacle()
-
-            if self.obstacles:
-                last_obstacle = self.obstacles[-1]
-                last_obstacle.pos[1] = random.randint(100, HEIGHT // 2)  # Place in upper half of screen
-
     def draw_lava_countdown(self, screen):
-        if not self.lava.moving_enabled:
-            remaining = max(0, (self.lava.start_delay - (pygame.time.get_ticks() - self.lava.start_time)) / 1000)
-            countdown_text = font.render(f"Lava starts in: {remaining:.1f}s", True, RED)
-            screen.blit(countdown_text, (WIDTH // 2 - countdown_text.get_width() // 2, HEIGHT - 50))
-
-    def handle_key_press(self, key):
-        for obstacle in self.obstacles:
-            if key == obstacle.key:
-                if obstacle.is_trap:
-                    sound_thread = threading.Thread(target=lambda: self.play_sound_effect(wrong_key_sound))
-                    sound_thread.start()
-                    rock_thread = threading.Thread(target=self.display_rock_image)
-                    rock_thread.start()
-                    self.lives -= 1
-                else:
-                    self.score += 10
-                    self.player.climb()
-                    self.background.move(self.player.rect, HEIGHT)
-
-                    # Use the lava's move_down method which is properly implemented
-                    down_amount = 100  # Adjust this value as needed
-                    self.lava.move_down(down_amount)
-
-                    # Ensure lava speed is properly adjusted
-                    self.adjust_lava_speed()
-
-                self.obstacles.remove(obstacle)
-                break
+        if not self.simulation.lava.moving_enabled:
+            remaining = self.simulation.lava.delay_remaining
+            countdown_text = text_renderer.render(f"Lava starts in: {remaining:.1f}s", FONT_SIZE, RED)
+            return screen.blit(countdown_text, (WIDTH // 2 - countdown_text.get_width() // 2, HEIGHT - 50))
+        return None
 
     def log_positions(self):
-        player_pos = (self.player.rect.x, self.player.rect.y)
-        lava_pos = (self.lava.rect.x, self.lava.rect.y)
+        player_pos = (self.simulation.player.rect.x, self.simulation.player.rect.y)
+        lava_pos = (self.simulation.lava.rect.x, self.simulation.lava.rect.y)
         print(f"Player Position: {player_pos}, Lava Position: {lava_pos}")
 
     def display_positions(self, screen):
-        player_pos_text = font.render(f"Player: {self.player.rect.topleft}", True, BLACK)
-        lava_pos_text = font.render(f"Lava: {self.lava.rect.topleft}", True, BLACK)
-        screen.blit(player_pos_text, (20, 100))
-        screen.blit(lava_pos_text, (20, 140))
+        text_renderer.draw(screen, f"Player: {self.simulation.player.rect.topleft}", FONT_SIZE, BLACK, (20, 100))
+        text_renderer.draw(screen, f"Lava: {self.simulation.lava.rect.topleft}", FONT_SIZE, BLACK, (20, 140))
 
     def pause_menu(self):
         paused = True
@@ -702,17 +405,25 @@ class Game:
         overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
         overlay.fill((0, 0, 0, 200))  # Fill with black color and set transparency level (0-255)
 
+        # The paused frame never changes, so compose it once
+        game_frame = screen.copy()
+        pause_layer = ScreenLayer((WIDTH, HEIGHT))
+
+        def draw_static(surface):
+            surface.blit(game_frame, (0, 0))
+            surface.blit(overlay, (0, 0))  # Draw the semi-transparent overlay
+            text_renderer.draw_centered(surface, "Pause", FONT_SIZE, WHITE, WIDTH // 2, HEIGHT // 2 - 50)
+            text_renderer.draw_centered(surface, "Appuyer sur ESC pour reprendre", FONT_SIZE, WHITE,
+                                        WIDTH // 2, HEIGHT // 2)
+            text_renderer.draw_centered(surface, "Appuyer sur M pour retourner au menu principal", FONT_SIZE, WHITE,
+                                        WIDTH // 2, HEIGHT // 2 + 50)
+
         while paused:
-            screen.blit(overlay, (0, 0))  # Draw the semi-transparent overlay
-            pause_text = font.render("Pause", True, (255, 255, 255))
-            resume_text = font.render("Appuyer sur ESC pour reprendre", True, (255, 255, 255))
-            main_menu_text = font.render("Appuyer sur M pour retourner au menu principal", True, (255, 255, 255))
-            screen.blit(pause_text, (WIDTH // 2 - pause_text.get_width() // 2, HEIGHT // 2 - 50))
-            screen.blit(resume_text, (WIDTH // 2 - resume_text.get_width() // 2, HEIGHT // 2))
-            screen.blit(main_menu_text, (WIDTH // 2 - main_menu_text.get_width() // 2, HEIGHT // 2 + 50))
+            pause_layer.draw(screen, None, draw_static)
             pygame.display.flip()
+            self.clock.tick(30)
 
-            for event in pygame.event.get():
+            for event in pygame.event.get(exclude=SCORES_UPDATED):
                 if event.type == pygame.QUIT:
                     self.running = False
                     paused = False
@@ -723,72 +434,81 @@ class Game:
                         self.show_menu()
                         paused = False
 
+        # The pause screen covered everything, the next game frame must be pushed whole
+        self.dirty_rects.request_full()
+
     def display_rock_image(self):
         rock_number = random.randint(1, MAX_ROCK_IMG)
         rock_image_path = f'./ressources/rocks/rock{rock_number}.jpeg'
         try:
-            # Load the image
-            temp_image = pygame.image.load(rock_image_path)
-
-            # Create a new surface and scale it
-            self.rock_image = pygame.transform.scale(temp_image, (WIDTH, HEIGHT))
-
-            # Ensure the surface is not locked
-            if self.rock_image.get_locked():
-                self.rock_image.unlock()
-
+            # Already decoded and scaled by the asset manager
+            self.rock_image = assets.image(rock_image_path, (WIDTH, HEIGHT))
             self.rock_display_time = time.time() + 1
         except pygame.error as e:
             print(f"Failed to load image at {rock_image_path}: {e}")
             self.rock_image = None
 
     def display_game_over(self):
-        game_over_text = font.render("Fin de la partie", True, RED)
-        restart_text = font.render("Appuyer sur R pour redémarrer", True, RED)
-        menu_text = font.render("Appuyer sur M pour le menu", True, RED)
-        user_score_text = font.render(f"Votre score: {self.score}", True, BLACK)
-
         current_difficulty = self.settings.settings['difficulty']
 
-        # Check if this is a new best score for the current difficulty
-        is_new_best_score = False
-        filtered_scores = [s for s in self.high_scores if
-                           isinstance(s, dict) and
-                           s.get('difficulty', current_difficulty) == current_difficulty]
-
-        if not filtered_scores or self.score > filtered_scores[0]['score']:
-            is_new_best_score = True
-
-        # Display information based on current scores
-        if filtered_scores:
-            top_score = filtered_scores[0]
-            high_score_text = font.render(
-                f"Meilleur score ({current_difficulty}): {top_score['score']} par {top_score['name']}",
-                True, BLACK)
-        else:
-            high_score_text = font.render(f"Pas encore de score pour {current_difficulty}", True, BLACK)
-
-        # Also show overall best score regardless of difficulty
-        if self.high_scores and isinstance(self.high_scores[0], dict):
-            overall_best = self.high_scores[0]
-            overall_difficulty = overall_best.get('difficulty', 'unknown')
-            overall_text = font.render(
-                f"Record absolu: {overall_best['score']} par {overall_best['name']} ({overall_difficulty})",
-                True, BLACK)
-            screen.blit(overall_text, (WIDTH // 2 - overall_text.get_width() // 2, HEIGHT // 2 - 25))
+        def draw_static(surface):
+            surface.fill(WHITE)
+            game_over_text = text_renderer.render("Fin de la partie", FONT_SIZE, RED)
+            restart_text = text_renderer.render("Appuyer sur R pour redémarrer", FONT_SIZE, RED)
+            menu_text = text_renderer.render("Appuyer sur M pour le menu", FONT_SIZE, RED)
+            user_score_text = text_renderer.render(f"Votre score: {self.simulation.score}", FONT_SIZE, BLACK)
+
+            # Check if this is a new best score for the current difficulty
+            self.is_new_best_score = False
+            filtered_scores = [s for s in self.high_scores if
+                               isinstance(s, dict) and
+                               s.get('difficulty', current_difficulty) == current_difficulty]
+
+            if not filtered_scores or self.simulation.score > filtered_scores[0]['score']:
+                self.is_new_best_score = True
+
+            # Display information based on current scores
+            if filtered_scores:
+                top_score = filtered_scores[0]
+                high_score_text = text_renderer.render(
+                    f"Meilleur score ({current_difficulty}): {top_score['score']} par {top_score['name']}",
+                    FONT_SIZE, BLACK)
+            else:
+                high_score_text = text_renderer.render(f"Pas encore de score pour {current_difficulty}",
+                                                       FONT_SIZE, BLACK)
+
+            # Also show overall best score regardless of difficulty
+            if self.high_scores and isinstance(self.high_scores[0], dict):
+                overall_best = self.high_scores[0]
+                overall_difficulty = overall_best.get('difficulty', 'unknown')
+                overall_text = text_renderer.render(
+                    f"Record absolu: {overall_best['score']} par {overall_best['name']} ({overall_difficulty})",
+                    FONT_SIZE, BLACK)
+                surface.blit(overall_text, (WIDTH // 2 - overall_text.get_width() // 2, HEIGHT // 2 - 25))
+
+            surface.blit(game_over_text, (WIDTH // 2 - game_over_text.get_width() // 2, HEIGHT // 2 - 100))
+            surface.blit(user_score_text, (WIDTH // 2 - user_score_text.get_width() // 2, HEIGHT // 2 - 50))
+            surface.blit(high_score_text, (WIDTH // 2 - high_score_text.get_width() // 2, HEIGHT // 2))
+            surface.blit(restart_text, (WIDTH // 2 - restart_text.get_width() // 2, HEIGHT // 2 + 50))
+            surface.blit(menu_text, (WIDTH // 2 - menu_text.get_width() // 2, HEIGHT // 2 + 100))
+            if self.scores_note:
+                note_text = text_renderer.render(self.scores_note, FONT_SIZE // 2, BLACK)
+                surface.blit(note_text, (WIDTH // 2 - note_text.get_width() // 2, HEIGHT // 2 + 150))
+
+        self.game_over_layer.draw(screen, (self.simulation.score, current_difficulty, self.scores_version), draw_static)
 
         # Display the new best score message with animation effect
-        if is_new_best_score and self.score > 0:
+        if self.is_new_best_score and self.simulation.score > 0:
             # Create pulsing text effect using sine wave
             pulse = (math.sin(pygame.time.get_ticks() * 0.005) + 1) * 0.5  # 0.0 to 1.0
             size_factor = 1.0 + pulse * 0.3  # Pulse between 1.0x and 1.3x
 
-            new_best_font = pygame.font.Font(None, int(72 * size_factor))
-            new_best_text = new_best_font.render("NOUVEAU RECORD!", True, (255, 215, 0))  # Gold color
+            new_best_size = int(72 * size_factor)
+            new_best_text = text_renderer.render("NOUVEAU RECORD!", new_best_size, (255, 215, 0))  # Gold color
 
             # Add glowing effect by drawing the text multiple times with different colors
+            glow_surface = text_renderer.render("NOUVEAU RECORD!", new_best_size, (255, 215, 0, 100))
             for offset in range(3, 0, -1):
-                glow_surface = new_best_font.render("NOUVEAU RECORD!", True, (255, 215, 0, 100))
                 screen.blit(glow_surface,
                             (WIDTH // 2 - glow_surface.get_width() // 2,
                              HEIGHT // 2 - 200 - offset * 2))
@@ -797,12 +517,6 @@ class Game:
                         (WIDTH // 2 - new_best_text.get_width() // 2,
                          HEIGHT // 2 - 200))
 
-        screen.blit(game_over_text, (WIDTH // 2 - game_over_text.get_width() // 2, HEIGHT // 2 - 100))
-        screen.blit(user_score_text, (WIDTH // 2 - user_score_text.get_width() // 2, HEIGHT // 2 - 50))
-        screen.blit(high_score_text, (WIDTH // 2 - high_score_text.get_width() // 2, HEIGHT // 2))
-        screen.blit(restart_text, (WIDTH // 2 - restart_text.get_width() // 2, HEIGHT // 2 + 50))
-        screen.blit(menu_text, (WIDTH // 2 - menu_text.get_width() // 2, HEIGHT // 2 + 100))
-
         pygame.display.flip()
 
     def show_settings_menu(self):
@@ -821,11 +535,12 @@ class Game:
                                     10, 100, self.settings.settings['square_size'])
 
         settings_running = True
+        sliders = [menu_music_slider, game_music_slider, sound_effects_slider, font_size_slider, square_size_slider]
+
         while settings_running:
-            screen.blit(self.background_image, (0, 0))  # Draw the background image
-            title_text = font.render("Paramètres", True, BLACK)
-            back_text = font.render("Appuyer sur B pour retourner à l'écran précédent", True, BLACK)
-            validate_text = font.render("Appuyer sur V pour confirmer", True, BLACK)
+            title_text = text_renderer.render("Paramètres", FONT_SIZE, BLACK)
+            back_text = text_renderer.render("Appuyer sur B pour retourner à l'écran précédent", FONT_SIZE, BLACK)
+            validate_text = text_renderer.render("Appuyer sur V pour confirmer", FONT_SIZE, BLACK)
 
             title_x = WIDTH // 2 - title_text.get_width() // 2
             title_y = HEIGHT // 2 - 300
@@ -834,32 +549,38 @@ class Game:
             validate_x = WIDTH // 2 - validate_text.get_width() // 2
             validate_y = back_y + 50
 
-            # Function to draw text with border
-            def draw_text_with_border(text, x, y):
-                border_color = (255, 255, 255)  # White border color
-                screen.blit(font.render(text, True, border_color), (x - 2, y - 2))
-                screen.blit(font.render(text, True, border_color), (x + 2, y - 2))
-                screen.blit(font.render(text, True, border_color), (x - 2, y + 2))
-                screen.blit(font.render(text, True, border_color), (x + 2, y + 2))
-                screen.blit(font.render(text, True, BLACK), (x, y))  # Main text
-
-            draw_text_with_border("Paramètres", title_x, title_y)
-            draw_text_with_border("Appuyer sur B pour retourner à l'écran précédent", back_x, back_y)
-            draw_text_with_border("Appuyer sur V pour confirmer", validate_x, validate_y)
-
-            # Draw all sliders
-            menu_music_slider.draw(screen)
-            game_music_slider.draw(screen)
-            sound_effects_slider.draw(screen)
-            font_size_slider.draw(screen)
-            square_size_slider.draw(screen)
+            def draw_static(surface):
+                surface.blit(self.background_image, (0, 0))  # Draw the background image
+
+                # Function to draw text with border
+                def draw_text_with_border(text, x, y):
+                    text_renderer.draw(surface, text, FONT_SIZE, BLACK, (x, y), outline=WHITE)
+
+                draw_text_with_border("Paramètres", title_x, title_y)
+                draw_text_with_border("Appuyer sur B pour retourner à l'écran précédent", back_x, back_y)
+                draw_text_with_border("Appuyer sur V pour confirmer", validate_x, validate_y)
+
+                # Slider tracks never move, only their handles do
+                for slider in sliders:
+                    slider.draw_track(surface)
+
+            self.settings_layer.draw(screen, None, draw_static)
+
+            # Draw all slider handles
+            for slider in sliders:
+                slider.draw_handle(screen)
 
             # Draw slider labels
-            menu_music_label = font.render(f"Musique du menu: {int(menu_music_slider.value * 100)}%", True, BLACK)
-            game_music_label = font.render(f"Musique du jeu: {int(game_music_slider.value * 100)}%", True, BLACK)
-            sound_effects_label = font.render(f"Effets sonores: {int(sound_effects_slider.value * 100)}%", True, BLACK)
-            font_size_label = font.render(f"Taille de la police: {int(font_size_slider.value)}", True, BLACK)
-            square_size_label = font.render(f"Taille des obstacles: {int(square_size_slider.value)}", True, BLACK)
+            menu_music_label = text_renderer.render(f"Musique du menu: {int(menu_music_slider.value * 100)}%",
+                                                    FONT_SIZE, BLACK)
+            game_music_label = text_renderer.render(f"Musique du jeu: {int(game_music_slider.value * 100)}%",
+                                                    FONT_SIZE, BLACK)
+            sound_effects_label = text_renderer.render(f"Effets sonores: {int(sound_effects_slider.value * 100)}%",
+                                                       FONT_SIZE, BLACK)
+            font_size_label = text_renderer.render(f"Taille de la police: {int(font_size_slider.value)}",
+                                                   FONT_SIZE, BLACK)
+            square_size_label = text_renderer.render(f"Taille des obstacles: {int(square_size_slider.value)}",
+                                                     FONT_SIZE, BLACK)
 
             # Position labels
             screen.blit(menu_music_label, (menu_music_slider.rect.x, menu_music_slider.rect.y - 30))
@@ -869,8 +590,9 @@ class Game:
             screen.blit(square_size_label, (square_size_slider.rect.x, square_size_slider.rect.y - 30))
 
             pygame.display.flip()
+            self.clock.tick(30)
 
-            for event in pygame.event.get():
+            for event in pygame.event.get(exclude=SCORES_UPDATED):
                 if event.type == pygame.QUIT:
                     self.running = False
                     settings_running = False
@@ -906,8 +628,132 @@ class Game:
 
                 # Apply menu music volume immediately for feedback
                 if event.type == pygame.MOUSEBUTTONUP:
-                    if pygame.mixer.music.get_busy():
-                        pygame.mixer.music.set_volume(menu_music_slider.value)
+                    self.audio.set_group_volume('menu_music', menu_music_slider.value)
+
+    def reset_clock(self):
+        """Restart simulation timing, so time spent on modal screens is not simulated afterwards"""
+        self.last_frame_time = time.perf_counter()
+        self.simulation.accumulator = 0.0
+
+    def handle_events(self):
+        """Handle window and menu keys, returning the letters typed for the simulation"""
+        letters = []
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.running = False
+            if event.type == SCORES_UPDATED:
+                self.on_scores_updated(event)
+            if event.type != pygame.KEYDOWN:
+                continue
+            if event.key == pygame.K_F3:
+                self.profiler.toggle()
+                self.dirty_rects.request_full()
+                continue
+
+            if self.death_animation and not self.death_animation.done:
+                # Handle events during animation
+                if event.key == pygame.K_r:
+                    self.reset_game()
+                    self.death_animation = None
+                if event.key == pygame.K_m:
+                    self.show_menu()
+                    self.reset_game()
+                    self.death_animation = None
+
+            elif not self.simulation.game_over:
+                if event.key == pygame.K_ESCAPE:
+                    self.pause_menu()
+                    self.reset_clock()
+                else:
+                    letters.append(pygame.key.name(event.key).upper())
+
+            else:
+                if event.key == pygame.K_r:
+                    self.reset_game()
+                if event.key == pygame.K_m:
+                    self.show_menu()
+                    self.reset_game()
+        return letters
+
+    def handle_simulation_events(self, events):
+        """Play the sounds and animations matching what happened in the simulation"""
+        for event, value in events:
+            if event == 'trap':
+                self.audio.play('wrong_key')
+                self.display_rock_image()
+            elif event == 'missed':
+                print(f"Missed letter - lives remaining: {self.simulation.lives}")
+            elif event == 'game_over' and value == 'lives':
+                print("Game over: No lives remaining (missed too many letters)")
+                self.start_death_animation('rock_loose.gif')
+            elif event == 'game_over':
+                print("Game over: Player touched lava")
+                self.start_death_animation('lavaloose.gif')
+
+    def render(self, alpha):
+        """Draw the current state, alpha being how far we are between the last two simulation steps"""
+        screen.fill(WHITE)
+
+        if self.death_animation and not self.death_animation.done:
+            self.dirty_rects.request_full()
+            self.death_animation.draw(screen)
+
+        elif not self.simulation.game_over:
+            # Normal game logic
+            with self.profiler.measure('draw_background'):
+                self.simulation.background.draw(screen)
+
+            if self.simulation.tutorial_active:
+                # Tutorial code (unchanged)
+                self.dirty_rects.request_full()
+                obstacle_atlas.draw_all(screen, self.simulation.tutorial_letters, self.font_size)
+
+                instruction_text = text_renderer.render("Appuyez sur les lettres pour démarrer !", 48, BLACK)
+                screen.blit(instruction_text,
+                            (WIDTH // 2 - instruction_text.get_width() // 2,
+                             HEIGHT // 2 - 100))
+
+                if self.simulation.countdown_active:
+                    self.draw_countdown(screen)
+
+            else:
+                with self.profiler.measure('draw_obstacles'):
+                    self.dirty_rects.extend(obstacle_atlas.draw_all(screen, self.simulation.obstacles, self.font_size, alpha))
+                with self.profiler.measure('draw_player'):
+                    self.dirty_rects.add(self.simulation.player.draw(screen))
+                with self.profiler.measure('draw_lava'):
+                    self.dirty_rects.add(self.simulation.lava.draw(screen, alpha))
+
+                with self.profiler.measure('draw_overlays'):
+                    if not self.simulation.lava.moving_enabled:
+                        self.dirty_rects.add(self.draw_lava_countdown(screen))
+
+                    if self.rock_image and time.time() < self.rock_display_time:
+                        screen.blit(self.rock_image, (
+                            WIDTH // 2 - self.rock_image.get_width() // 2,
+                            HEIGHT // 2 - self.rock_image.get_height() // 2))
+                        self.dirty_rects.request_full()
+                    elif self.rock_image:
+                        self.rock_image = None
+                        self.dirty_rects.request_full()
+
+                with self.profiler.measure('hud'):
+                    self.dirty_rects.extend(self.hud.draw(screen, self.simulation))
+
+        else:
+            self.dirty_rects.request_full()
+            if not self.death_animation or self.death_animation.done:
+                self.display_game_over()
+
+        # Scrolling moves every pixel of the background
+        if self.simulation.background.rect1.y != self.rendered_background_top:
+            self.rendered_background_top = self.simulation.background.rect1.y
+            self.dirty_rects.request_full()
+
+        self.dirty_rects.add(self.profiler.draw(screen))
+
+        with self.profiler.measure('flip'):
+            self.dirty_rects.present()
 
     def run(self):
         try:
@@ -916,248 +762,48 @@ class Game:
             self.play_menu_music()
             self.show_menu()
             self.death_animation = None
+            self.rendered_background_top = self.simulation.background.rect1.y
+            self.reset_clock()
 
             while self.running:
-                screen.fill(WHITE)
-
-
-                if self.death_animation and not self.death_animation.done:
-
-                    self.death_animation.update()
-                    self.death_animation.draw(screen)
-
-                    # Handle events during animation
-                    for event in pygame.event.get():
-                        if event.type == pygame.QUIT:
-                            self.running = False
-                        if event.type == pygame.KEYDOWN:
-                            if event.key == pygame.K_r:
-                                self.reset_game()
-                                self.death_animation = None
-                            if event.key == pygame.K_m:
-                                self.show_menu()
-                                self.reset_game()
-                                self.death_animation = None
-
-                elif not self.game_over:
-                    # Normal game logic
-                    self.background.draw(screen)
-
-                    if self.tutorial_active:
-                        # Tutorial code (unchanged)
-                        for obstacle in self.tutorial_letters:
-                            obstacle.draw(screen, font)
-
-                        instruction_font = pygame.font.Font(None, 48)
-                        instruction_text = instruction_font.render("Appuyez sur les lettres pour démarrer !", True, BLACK)
-                        screen.blit(instruction_text,
-                                    (WIDTH // 2 - instruction_text.get_width() // 2,
-                                     HEIGHT // 2 - 100))
-
-                        if self.countdown_active:
-                            self.draw_countdown(screen)
-
-                        for event in pygame.event.get():
-                            if event.type == pygame.QUIT:
-                                self.running = False
-                            if event.type == pygame.KEYDOWN:
-                                if event.key == pygame.K_ESCAPE:
-                                    self.pause_menu()
-                                else:
-                                    letter = pygame.key.name(event.key).upper()
-                                    self.handle_tutorial_key_press(letter)
-
-                    else:
-                        self.adjust_difficulty()
-                        self.adjust_lava_speed()
-
-                        if random.randint(0, self.spawn_rate) == 0:
-                            self.generate_obstacle()
-
-                        for obstacle in self.obstacles[:]:
-                            obstacle.move_down()
-                            if obstacle.pos[1] > HEIGHT:
-                                self.obstacles.remove(obstacle)
-                                print(f"Missed letter - lives remaining: {self.lives}")
-
-
-                                if obstacle.pos[1] > self.lava.rect.top:
-                                    self.lava.speed_up(self.difficulty.lava_speed_increment)
-
-                                if self.lives <= 0:
-                                    print("Game over: No lives remaining (missed too many letters)")
-                                    self.game_over = True
-                                    self.start_death_animation('rock_loose.gif')
-                            obstacle.draw(screen, font)
-
-                        for event in pygame.event.get():
-                            if event.type == pygame.QUIT:
-                                self.running = False
-                            if event.type == pygame.KEYDOWN:
-                                if event.key == pygame.K_ESCAPE:
-                                    self.pause_menu()
-                                else:
-                                    letter = pygame.key.name(event.key).upper()
-                                    self.handle_key_press(letter)
-
-                        self.player.draw(screen)
-                        self.lava.update_position()
-                        self.lava.draw(screen)
-
-                        if not self.lava.moving_enabled:
-                            self.draw_lava_countdown(screen)
-
-                        self.background.move(self.player.rect, HEIGHT)
-
-                        if self.rock_image and time.time() < self.rock_display_time:
-                            screen.blit(self.rock_image, (
-                                WIDTH // 2 - self.rock_image.get_width() // 2,
-                                HEIGHT // 2 - self.rock_image.get_height() // 2))
-                        else:
-                            self.rock_image = None
-
-                        self.draw_hud(screen)
-
-                        # Check if player has touched lava
-                        if self.player.rect.bottom > self.lava.rect.top:
-                            print("Game over: Player touched lava")
-                            self.game_over = True
-                            self.start_death_animation('lavaloose.gif')
-
-                else:
-                    if not self.death_animation or self.death_animation.done:
-                        self.display_game_over()
-
-                        for event in pygame.event.get():
-                            if event.type == pygame.QUIT:
-                                self.running = False
-                            if event.type == pygame.KEYDOWN:
-                                if event.key == pygame.K_r:
-                                    self.reset_game()
-                                if event.key == pygame.K_m:
-                                    self.show_menu()
-                                    self.reset_game()
-
-                pygame.display.flip()
-                self.clock.tick(45)
+                self.profiler.begin_frame()
+                now = time.perf_counter()
+                elapsed = now - self.last_frame_time
+                self.last_frame_time = now
+
+                with self.profiler.measure('events'):
+                    letters = self.handle_events()
+
+                # Run as many fixed steps as the elapsed time asks for, whatever the frame rate is
+                self.handle_simulation_events(self.simulation.step(elapsed, letters, MAX_STEPS_PER_FRAME))
+                for _ in range(self.simulation.ticks_run):
+                    self.hud.update(self.simulation)
+                    if self.death_animation and not self.death_animation.done:
+                        self.death_animation.update()
+
+                self.render(self.simulation.interpolation)
+                self.profiler.end_frame()
+                self.clock.tick(RENDER_FPS)
         except KeyboardInterrupt:
             print("Game interrupted by user.")
         except Exception as e:
             print(f"Game crashed with error: {e}")
         finally:
+            if self.profiler.frame:
+                # Reported with the frame profile, when one was recorded (KEYSCALE_PROFILE or F3)
+                print(f"Death animation latency: {self.death_animations.stats()}")
+            self.profiler.close()
             pygame.quit()
 
     def start_death_animation(self, animation_file):
-        """Start death animation with synchronized sound after small delay"""
-        from model.Animation import Animation
-        import threading
-
-        # Create and initialize the animation
-        animation_path = f'./ressources/{animation_file}'
-        print(f"Loading death animation: {animation_path}")
-
-        # Create the animation
-        self.death_animation = Animation(animation_path, WIDTH, HEIGHT,
-                                         skip_fade_in=('lava' not in animation_file))
-
-        # Load sound immediately to avoid delays
-        try:
-            death_sound = pygame.mixer.Sound('./ressources/death.mp3')
-            # Apply sound effects volume setting
-            death_sound.set_volume(self.settings.settings['sound_effects_volume'])
-        except Exception as e:
-            print(f"Error loading death sound: {e}")
-            return
-
-        # Use a single approach to play the death sound
-        # Remove the play_sound_with_delay function and thread
-
-        def monitor_animation_and_play_sound():
-            wait_start = time.time()
-            while not self.death_animation.loading_complete and time.time() - wait_start < 2:
-                time.sleep(0.05)
-
-            if not self.death_animation.loading_complete:
-                print("Animation loading timed out")
-                return
-
-            total_frames = len(self.death_animation.frames)
-            if total_frames == 0:
-                print("No animation frames loaded")
-                return
-
-            target_frame = int(total_frames * 0.5)
-            print(f"Will play sound at frame {target_frame} of {total_frames}")
-
-            last_frame = -1
-            while not self.death_animation.done:
-                current_frame = self.death_animation.current_frame
-
-                # Only check when frame changes to reduce CPU usage
-                if current_frame != last_frame:
-                    last_frame = current_frame
-
-                    # Debug information
-                    if current_frame % 5 == 0:  # Only log every 5th frame
-                        print(f"Animation at frame {current_frame}/{total_frames}")
-
-                    # Play sound at target frame
-                    if current_frame == target_frame:
-                        print("Playing death sound")
-                        death_sound.play()
-                        break
-
-                time.sleep(0.01)
-
-        # Start the monitoring thread
-        sound_thread = threading.Thread(target=monitor_animation_and_play_sound)
-        sound_thread.daemon = True
-        sound_thread.start()
-
+        """Start death animation, the death sound plays when it reaches its middle frame"""
+        # Preloaded during the tutorial, the pooled animation is only rewound
+        self.death_animation = self.death_animations.acquire(animation_file,
+                                                             skip_fade_in=('lava' not in animation_file))
+        self.death_animation.add_cue(0.5, lambda: self.audio.play('death', priority=PRIORITY_HIGH))
         print(f"Death animation started: {animation_file}")
 
-        def monitor_animation_and_play_sound():
-            wait_start = time.time()
-            while not self.death_animation.loading_complete and time.time() - wait_start < 2:
-                time.sleep(0.05)
-
-            if not self.death_animation.loading_complete:
-                print("Animation loading timed out")
-                return
-
-            total_frames = len(self.death_animation.frames)
-            if total_frames == 0:
-                print("No animation frames loaded")
-                return
-
-            target_frame = int(total_frames * 0.5)
-            print(f"Will play sound at frame {target_frame} of {total_frames}")
-
-            last_frame = -1
-            while not self.death_animation.done:
-                current_frame = self.death_animation.current_frame
-
-                # Only check when frame changes to reduce CPU usage
-                if current_frame != last_frame:
-                    last_frame = current_frame
-
-                    # Debug information
-                    if current_frame % 5 == 0:  # Only log every 5th frame
-                        print(f"Animation at frame {current_frame}/{total_frames}")
-
-                    # Play sound at target frame
-                    if current_frame == target_frame:
-                        print("Playing death sound")
-                        death_sound.play()
-                        break
-
-                time.sleep(0.01)
-
-        # Start the monitoring thread
-        sound_thread = threading.Thread(target=monitor_animation_and_play_sound)
-        sound_thread.daemon = True
-        sound_thread.start()
-
 if __name__ == "__main__":
+    init_display()
     game = Game()
     game.run()
\ No newline at end of file
@@ -0,0 +1,101 @@
+# benchmarks/harness.py
+import json
+import math
+import platform
+import statistics
+import time
+
+import pygame
+
+
+class BenchmarkRunner:
+    """
+    Times registered cases with perf_counter_ns and summarises each one as median and p95 in milliseconds.
+    A case is a callable timed `number` times in a row per sample, its optional setup runs untimed before each sample.
+    """
+
+    def __init__(self, repeat=50, name_filter=None):
+        self.repeat = repeat
+        self.name_filter = name_filter
+        self.results = {}
+
+    def bench(self, name, func, setup=None, repeat=None, number=1):
+        if self.name_filter and self.name_filter not in name:
+            return None
+        samples = []
+        for _ in range(repeat or self.repeat):
+            if setup is not None:
+                setup()
+            start = time.perf_counter_ns()
+            for _ in range(number):
+                func()
+            samples.append((time.perf_counter_ns() - start) / number / 1e6)
+        self.results[name] = self.summarise(samples)
+        return self.results[name]
+
+    @staticmethod
+    def summarise(samples):
+        ordered = sorted(samples)
+        return {
+            'median_ms': statistics.median(ordered),
+            'p95_ms': ordered[max(0, math.ceil(len(ordered) * 0.95) - 1)],
+            'min_ms': ordered[0],
+            'samples': len(ordered),
+        }
+
+    def report(self, resolution):
+        return {
+            'meta': {
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'python': platform.python_version(),
+                'pygame': pygame.version.ver,
+                'platform': platform.platform(),
+                'resolution': list(resolution),
+            },
+            'results': self.results,
+        }
+
+
+def compare(current, baseline, threshold=0.15, floor_ms=0.005):
+    """
+    Compare two reports case by case and return (rows, regressions).
+    A case regresses when its median is more than threshold slower than the baseline,
+    and by more than floor_ms so timer noise on tiny cases is not reported.
+    """
+    rows = []
+    regressions = []
+    for name, result in sorted(current['results'].items()):
+        base = baseline['results'].get(name)
+        if base is None:
+            rows.append((name, None, result['median_ms'], None, 'new'))
+            continue
+        ratio = result['median_ms'] / base['median_ms'] if base['median_ms'] else 1.0
+        slower = result['median_ms'] - base['median_ms'] > floor_ms
+        if ratio > 1 + threshold and slower:
+            status = 'REGRESSION'
+            regressions.append(name)
+        elif ratio < 1 - threshold:
+            status = 'faster'
+        else:
+            status = 'ok'
+        rows.append((name, base['median_ms'], result['median_ms'], ratio, status))
+    return rows, regressions
+
+
+def format_comparison(rows):
+    lines = [f"{'case':<40} {'baseline':>10} {'current':>10} {'ratio':>7}  status"]
+    for name, base, current, ratio, status in rows:
+        base_text = f"{base:.4f}" if base is not None else '-'
+        ratio_text = f"{ratio:.2f}x" if ratio is not None else '-'
+        lines.append(f"{name:<40} {base_text:>10} {current:>10.4f} {ratio_text:>7}  {status}")
+    return '\n'.join(lines)
+
+
+def load_report(path):
+    with open(path, 'r') as file:
+        return json.load(file)
+
+
+def save_report(report, path):
+    with open(path, 'w') as file:
+        json.dump(report, file, indent=2)
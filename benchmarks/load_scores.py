@@ -0,0 +1,189 @@
+# benchmarks/load_scores.py
+"""
+Load test of ScoreAPI against the local leaderboard server, to size its retries and connection pool.
+
+    python benchmarks/load_scores.py --clients 200 --games 5 --latency-ms 40 --error-rate 0.05
+    python benchmarks/load_scores.py --url http://127.0.0.1:8765/api   # server started on its own
+
+Every client stands for one machine: its own HttpClient, ScoreAPI, outbox and leaderboard cache, all of them
+in a temporary folder. Each game posts a score with save_game_score()
+and reads the leaderboard back with get_game_scores(), the calls the game makes. The report gives the throughput, the latency of each call as the game
+sees it (retries included), the retry amplification (HTTP attempts per call) and what the server stored,
+including the scores stored twice after a lost answer was retried.
+Without --url the server runs in this process and shares its CPU with the clients.
+"""
+import argparse
+import json
+import logging
+import math
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')  # The benchmark harness imports pygame
+
+from scores_api import HttpClient, LeaderboardCache, ScoreAPI, ScoreOutbox
+from benchmarks.harness import BenchmarkRunner, save_report
+from benchmarks.score_server import ScoreServer
+
+
+def summarise(samples):
+    """Median, p95 and min of BenchmarkRunner, plus the p99 and max the tail is judged on"""
+    if not samples:
+        return {'samples': 0}
+    ordered = sorted(samples)
+    summary = BenchmarkRunner.summarise(ordered)
+    summary['p99_ms'] = ordered[max(0, math.ceil(len(ordered) * 0.99) - 1)]
+    summary['max_ms'] = ordered[-1]
+    return summary
+
+
+class LoadClient:
+    """One machine playing games one after the other, timing each call"""
+
+    def __init__(self, index, url, args, outbox_dir):
+        self.index = index
+        self.games = args.games
+        self.think = args.think_ms / 1000
+        self.http = HttpClient(pool_maxsize=args.pool_size)
+        self.api = ScoreAPI(url, args.max_retries, args.retry_delay, self.http,
+                            ScoreOutbox(os.path.join(outbox_dir, f"{index}.jsonl")), args.timeout,
+                            LeaderboardCache(os.path.join(outbox_dir, f"{index}_leaderboard.json")), ttl=0)
+        self.latencies = {'submit': [], 'leaderboard': []}
+        self.failures = {'submit': 0, 'leaderboard': 0}
+        self.http_stats = None
+
+    def run(self, start):
+        start.wait()
+        for game in range(self.games):
+            self._timed('submit', lambda: self.api.save_game_score(f"load{self.index}", self.index * 1000 + game))
+            self._timed('leaderboard', self._leaderboard)
+            if self.think:
+                time.sleep(self.think)
+        self.http_stats = self.http.stats()  # Closing the session forgets its connections
+        self.http.close()
+
+    def _leaderboard(self):
+        # With ttl=0 every read goes to the server, the first one right away, the next ones through the background
+        # revalidation the game uses, waited for here. Failures are hidden behind the cache or the local file
+        fresh = []
+        scores = self.api.get_game_scores(on_update=lambda _, ok: fresh.append(ok))
+        self.api.wait_for_revalidation('game')
+        if fresh:
+            return scores if fresh[0] else None
+        return scores if self.api.leaderboard_status('game')['age'] is not None else None
+
+    def _timed(self, call, func):
+        began = time.perf_counter()
+        ok = func()
+        self.latencies[call].append((time.perf_counter() - began) * 1000)
+        if ok is None or ok is False:
+            self.failures[call] += 1
+
+
+def run_load(url, args):
+    outbox_dir = tempfile.mkdtemp(prefix='keyscale_load_')
+    clients = [LoadClient(index, url, args, outbox_dir) for index in range(args.clients)]
+    start = threading.Event()
+    threads = [threading.Thread(target=client.run, args=(start,), daemon=True) for client in clients]
+    for thread in threads:
+        thread.start()
+    began = time.perf_counter()
+    start.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - began
+
+    results = {'elapsed_s': elapsed}
+    calls = attempts = 0
+    for call in ('submit', 'leaderboard'):
+        samples = [latency for client in clients for latency in client.latencies[call]]
+        failures = sum(client.failures[call] for client in clients)
+        calls += len(samples)
+        results[call] = dict(summarise(samples), failures=failures,
+                             error_rate=failures / len(samples) if samples else 0.0)
+    connections = 0
+    for client in clients:
+        stats = client.http_stats
+        attempts += stats['requests']
+        connections += stats['connections_opened']
+    queued = sum(len(client.api.outbox.pending()) for client in clients)
+    shutil.rmtree(outbox_dir, ignore_errors=True)
+    results.update({
+        'calls': calls,
+        'throughput_per_s': calls / elapsed if elapsed else 0.0,
+        'http_attempts': attempts,
+        'retry_amplification': attempts / calls if calls else 0.0,
+        'connections_opened': connections,
+        'scores_queued_in_outbox': queued,
+    })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="KeyScale leaderboard load test")
+    parser.add_argument('--url', default=None, help="Leaderboard API to load, a local server is started otherwise")
+    parser.add_argument('--clients', type=int, default=100, help="Machines playing at the same time")
+    parser.add_argument('--games', type=int, default=5, help="Games played by each machine")
+    parser.add_argument('--think-ms', type=float, default=0.0, help="Pause between two games")
+    parser.add_argument('--max-retries', type=int, default=3, help="ScoreAPI retries per call")
+    parser.add_argument('--retry-delay', type=float, default=1.0, help="ScoreAPI delay between retries, in seconds")
+    parser.add_argument('--timeout', type=float, default=10.0, help="ScoreAPI timeout of each attempt, in seconds")
+    parser.add_argument('--pool-size', type=int, default=16, help="Connections kept by each client")
+    parser.add_argument('--latency-ms', type=float, default=20.0, help="Local server: mean answer delay")
+    parser.add_argument('--jitter-ms', type=float, default=10.0, help="Local server: spread of the delay")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Local server: share answered 503")
+    parser.add_argument('--timeout-rate', type=float, default=0.0, help="Local server: share never answered")
+    parser.add_argument('--idempotent', action='store_true',
+                        help="Local server: deduplicate by Idempotency-Key, which the real server does not")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', default=None, help="Write the JSON report to this file instead of stdout")
+    parser.add_argument('--verbose', action='store_true', help="Keep the ScoreAPI log of every retry")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logging.getLogger('ScoreAPI').setLevel(logging.CRITICAL)
+    server = None
+    url = args.url
+    if url is None:
+        server = ScoreServer(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+                             timeout_rate=args.timeout_rate, seed=args.seed,
+                             idempotent=args.idempotent).start_in_thread()
+        url = server.url
+
+    results = run_load(url, args)
+    if server is not None:
+        server.stop()
+        # Every game of every client posts a different (name, score), a pair seen twice is a duplicate
+        stored = [(score['name'], score['score']) for score in server.scores['game']]
+        results['server'] = {
+            'requests': {str(status): count for status, count in sorted(server.counts.items(), key=str)},
+            'game_scores_stored': len(stored),
+            'duplicate_scores_stored': len(stored) - len(set(stored)),
+        }
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'url': url,
+            'settings': {name: value for name, value in vars(args).items() if name not in ('output', 'verbose')},
+        },
+        'results': results,
+    }
+    if args.output:
+        save_report(report, args.output)
+    else:
+        print(json.dumps(report, indent=2))
+    print(f"{results['calls']} calls in {results['elapsed_s']:.1f}s ({results['throughput_per_s']:.0f}/s), "
+          f"submit p99 {results['submit'].get('p99_ms', 0):.0f} ms, "
+          f"{results['retry_amplification']:.2f} HTTP attempts per call"
+          + (f", {results['server']['duplicate_scores_stored']} duplicate scores" if server is not None else ""),
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+# benchmarks/run.py
+"""
+Headless benchmarks of the game logic and rendering hot paths.
+
+    python benchmarks/run.py                       # JSON report on stdout
+    python benchmarks/run.py --save-baseline       # store the report as benchmarks/baseline.json
+    python benchmarks/run.py --compare             # flag regressions against the stored baseline
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+# Headless: no window and no sound card are needed
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # Assets are loaded from ./ressources
+
+import pygame
+
+from model.Animation import Animation
+from model.Background import Background
+from model.FrameCache import frame_cache
+from model.Hud import Hud
+from model.Lava import Lava
+from model.Obstacle import Obstacle
+from model.ObstacleAtlas import obstacle_atlas
+from model.Simulation import Simulation, AVAILABLE_KEYS, SIMULATION_RATE
+from benchmarks.harness import BenchmarkRunner, compare, format_comparison, load_report, save_report
+
+DEFAULT_BASELINE = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+OBSTACLE_COUNTS = [10, 50, 200]
+LAVA_TOPS = [0.9, 0.5, 0.1]  # Lava top as a fraction of the screen height
+ANIMATIONS = ['lavaloose.gif', 'rock_loose.gif']
+FONT_SIZE = 36
+SQUARE_SIZE = 30
+
+
+def bench_simulation(runner, width, height):
+    sim = Simulation(width, height, 'moyen', SQUARE_SIZE, seed=1)
+    events = []
+
+    def start_game():
+        sim.reset('moyen')
+        sim.tutorial_active = False
+        for _ in range(10):
+            sim.generate_obstacle()
+
+    runner.bench('simulation.generate_obstacle', sim.generate_obstacle, setup=start_game, repeat=runner.repeat * 10)
+
+    target = []
+
+    def pick_letter():
+        start_game()
+        target[:] = [next(obstacle.key for obstacle in sim.obstacles if not obstacle.is_trap)]
+
+    runner.bench('simulation.handle_key_press', lambda: sim.handle_key_press(target[0], events),
+                 setup=pick_letter, repeat=runner.repeat * 10)
+    runner.bench('simulation.handle_key_press_miss', lambda: sim.handle_key_press('?', events),
+                 setup=start_game, repeat=runner.repeat * 10)
+    # One second of game per sample
+    runner.bench('simulation.tick', lambda: sim.tick(events), setup=start_game, number=SIMULATION_RATE)
+    return sim
+
+
+def bench_rendering(runner, screen, sim):
+    width, height = screen.get_size()
+
+    hud = Hud()
+    sim.score = 1230
+    hud.draw(screen, sim)  # Render the score text before timing
+    runner.bench('hud.draw', lambda: hud.draw(screen, sim))
+    hud.score_animation = 5
+    hud.draw(screen, sim)
+    runner.bench('hud.draw_pulse', lambda: hud.draw(screen, sim))
+
+    obstacle_atlas.configure(SQUARE_SIZE, FONT_SIZE)
+    for count in OBSTACLE_COUNTS:
+        obstacles = []
+        for i in range(count):
+            obstacle = Obstacle(width, i % 5 == 0, AVAILABLE_KEYS[i % len(AVAILABLE_KEYS)], SQUARE_SIZE, 4,
+                                (i * 37) % (width - SQUARE_SIZE))
+            obstacle.pos[1] = (i * 53) % height
+            obstacles.append(obstacle)
+        obstacle_atlas.draw_all(screen, obstacles, FONT_SIZE)  # Build the tiles before timing
+
+        def draw_each():
+            for obstacle in obstacles:
+                obstacle.draw(screen, FONT_SIZE)
+
+        runner.bench(f'obstacle.draw[{count}]', draw_each)
+        runner.bench(f'obstacle_atlas.draw_all[{count}]', lambda: obstacle_atlas.draw_all(screen, obstacles, FONT_SIZE))
+
+    lava = Lava(width, height, 0.5, './ressources/lava.jpg')
+    lava.draw(screen)  # Load the lava strip before timing
+    for top in LAVA_TOPS:
+        lava.rect.y = lava.previous_y = int(height * top)
+        runner.bench(f'lava.draw[top={int(top * 100)}%]', lambda: lava.draw(screen))
+
+    background = Background('./ressources/background.jpg', width, height)
+    background.rect1.y = height // 3
+    background.rect2.bottom = background.rect1.top
+    background.draw(screen)  # Load the image before timing
+    runner.bench('background.draw', lambda: background.draw(screen))
+
+
+def bench_animations(runner, width, height):
+    # The frame cache lives in a temporary folder, the user's own cache is neither read nor written
+    root = tempfile.mkdtemp(prefix='keyscale_bench_')
+    user_directory = frame_cache.directory
+    try:
+        for filename in ANIMATIONS:
+            def load():
+                animation = Animation(f'./ressources/{filename}', width, height)
+                animation.loading_thread.join()
+
+            def empty_cache():
+                frame_cache.directory = tempfile.mkdtemp(dir=root)
+
+            # Cold: decoded from the GIF and written to the cache, as on the first death
+            runner.bench(f'animation.load_cold[{filename}]', load, setup=empty_cache,
+                         repeat=max(1, runner.repeat // 10))
+            # Warm: every later death, served by the cache entry the last cold load left
+            runner.bench(f'animation.load_warm[{filename}]', load, repeat=max(1, runner.repeat // 10))
+    finally:
+        frame_cache.directory = user_directory
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="KeyScale headless benchmarks")
+    parser.add_argument('--resolution', default='1280x720', help="Screen size, e.g. 1920x1080")
+    parser.add_argument('--repeat', type=int, default=50, help="Samples per case")
+    parser.add_argument('--filter', default=None, help="Only run cases whose name contains this text")
+    parser.add_argument('--output', default=None, help="Write the JSON report to this file instead of stdout")
+    parser.add_argument('--save-baseline', action='store_true', help=f"Store the report as {DEFAULT_BASELINE}")
+    parser.add_argument('--compare', nargs='?', const=DEFAULT_BASELINE, default=None,
+                        help="Compare against a baseline report, exits with 1 on regression")
+    parser.add_argument('--threshold', type=float, default=0.15, help="Median slowdown ratio flagged as regression")
+    args = parser.parse_args()
+
+    width, height = (int(value) for value in args.resolution.lower().split('x'))
+    pygame.init()
+    screen = pygame.display.set_mode((width, height))
+
+    runner = BenchmarkRunner(args.repeat, args.filter)
+    # The game logs a lot to stdout, keep it out of the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        sim = bench_simulation(runner, width, height)
+        bench_rendering(runner, screen, sim)
+        bench_animations(runner, width, height)
+    pygame.quit()
+
+    report = runner.report((width, height))
+    if args.output:
+        save_report(report, args.output)
+    else:
+        print(json.dumps(report, indent=2))
+    if args.save_baseline:
+        save_report(report, DEFAULT_BASELINE)
+        print(f"Baseline saved to {DEFAULT_BASELINE}", file=sys.stderr)
+
+    if args.compare:
+        rows, regressions = compare(report, load_report(args.compare), args.threshold)
+        print(format_comparison(rows), file=sys.stderr)
+        if regressions:
+            print(f"{len(regressions)} regression(s): {', '.join(regressions)}", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
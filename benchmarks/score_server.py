@@ -0,0 +1,259 @@
+# benchmarks/score_server.py
+"""
+Local stand-in for the leaderboard server (scoresDisplay), to exercise ScoreAPI without the live one.
+
+    python benchmarks/score_server.py --port 8765 --latency-ms 40 --error-rate 0.05
+
+Same contract as scoresDisplay's ScoreController: GET scores/game and scores/cli return the top 10,
+POST validates like the Laravel rules (422 with the errors) and answers 201 with the stored score.
+Like the real server, a resent score is stored again. With --idempotent, an Idempotency-Key seen before
+gets the first answer back instead, to measure what server-side deduplication would save.
+Leaderboards carry an ETag, a GET with a matching If-None-Match gets an empty 304.
+Faults are injected after the latency: --error-rate answers 503 without storing anything,
+--timeout-rate stores the score then never answers, as when the response is lost on the way back.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+# Field -> (type check, required, max length or minimum), after ScoreController's validators
+RULES = {
+    'game': {
+        'name': ('string', True, 100),
+        'score': ('integer', True, 0),
+        'difficulty': ('string', False, 50),
+    },
+    'cli': {
+        'name': ('string', True, 100),
+        'score': ('integer', True, 0),
+        'letters': ('integer', False, 0),
+        'avg_time': ('numeric', False, 0),
+    },
+}
+DEFAULTS = {'game': {'difficulty': 'normal'}, 'cli': {'letters': 0, 'avg_time': 0}}
+REASONS = {200: 'OK', 201: 'Created', 304: 'Not Modified', 404: 'Not Found', 405: 'Method Not Allowed', 422: 'Unprocessable Content',
+           503: 'Service Unavailable'}
+TOP = 10
+
+
+def validate(kind, data):
+    """Laravel-style errors, {field: [messages]}, empty when the score is valid"""
+    if not isinstance(data, dict):
+        return {'body': ['The body must be a JSON object.']}
+    errors = {}
+    for field, (rule, required, limit) in RULES[kind].items():
+        value = data.get(field)
+        if value is None:
+            if required:
+                errors[field] = [f"The {field} field is required."]
+            continue
+        if rule == 'string':
+            if not isinstance(value, str):
+                errors[field] = [f"The {field} field must be a string."]
+            elif len(value) > limit:
+                errors[field] = [f"The {field} field must not be greater than {limit} characters."]
+            continue
+        number_types = (int,) if rule == 'integer' else (int, float)
+        if isinstance(value, bool) or not isinstance(value, number_types):
+            errors[field] = [f"The {field} field must be {'an integer' if rule == 'integer' else 'a number'}."]
+        elif value < limit:
+            errors[field] = [f"The {field} field must be at least {limit}."]
+    return errors
+
+
+class ScoreServer:
+    """
+    asyncio HTTP/1.1 server with keep-alive, scores are kept in memory.
+    latency_ms is the mean answer delay, spread uniformly by jitter_ms either way.
+    Counts requests by status, and the idempotent replays when idempotent is set, in self.counts.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0, timeout_rate=0.0,
+                 seed=None, idempotent=False):
+        self.host = host
+        self.port = port
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.timeout_rate = timeout_rate
+        self.random = random.Random(seed)
+        self.idempotent = idempotent
+        self.scores = {'game': [], 'cli': []}
+        self.answers = {}  # Idempotency-Key -> (status, body) of the first answer
+        self.counts = Counter()
+        self.next_id = 1
+        self.server = None
+        self.loop = None
+        self.thread = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}/api"
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._serve, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    def start_in_thread(self):
+        """Serve from an event loop on a daemon thread, returns once the port is open"""
+        ready = threading.Event()
+
+        def run():
+            self.loop = asyncio.new_event_loop()
+            self.loop.run_until_complete(self.start())
+            ready.set()
+            self.loop.run_forever()
+
+        self.thread = threading.Thread(target=run, daemon=True)
+        self.thread.start()
+        ready.wait()
+        return self
+
+    def stop(self):
+        """Stop the server started by start_in_thread(), dropping the connections still open"""
+        if self.loop is not None:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), self.loop).result()
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join()
+            self.loop.close()
+            self.loop = None
+
+    async def _shutdown(self):
+        self.server.close()
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _serve(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = (await reader.readline()).decode('latin-1').strip()
+                    if not line:
+                        break
+                    name, _, value = line.partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+
+                await asyncio.sleep(self._latency())
+                etag = None
+                fault = self.random.random()
+                if fault < self.error_rate:
+                    status, payload = 503, {'message': 'Service Unavailable'}
+                else:
+                    status, payload = self.handle(method, path, headers.get('idempotency-key'), body)
+                    if method == 'GET' and status == 200:
+                        etag = self.etag(payload)
+                        if headers.get('if-none-match') == etag:
+                            status, payload = 304, None
+                    if fault < self.error_rate + self.timeout_rate:
+                        self.counts['timeout'] += 1
+                        await reader.read()  # Until the client gives up and closes the connection
+                        break
+                self.counts[status] += 1
+                await self._answer(writer, status, payload, etag)
+                if headers.get('connection', '').lower() == 'close':
+                    break
+        except (ConnectionError, ValueError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    def _latency(self):
+        delay = self.latency_ms + self.random.uniform(-self.jitter_ms, self.jitter_ms)
+        return max(0.0, delay) / 1000
+
+    def handle(self, method, path, key, body):
+        """(status, payload) of a request, the scores are only touched here"""
+        route = path.split('?', 1)[0].rstrip('/')
+        kind = route.rsplit('/', 1)[-1]
+        if not route.endswith(f"/scores/{kind}") or kind not in RULES:
+            return 404, {'message': 'Not Found'}
+        if method == 'GET':
+            return 200, sorted(self.scores[kind], key=lambda score: score['score'], reverse=True)[:TOP]
+        if method != 'POST':
+            return 405, {'message': 'Method Not Allowed'}
+
+        if not self.idempotent:
+            key = None  # ScoreController ignores the header
+        if key and key in self.answers:
+            self.counts['replayed'] += 1
+            return self.answers[key]
+        try:
+            data = json.loads(body or b'null')
+        except ValueError:
+            data = None
+        errors = validate(kind, data)
+        if errors:
+            answer = 422, {'errors': errors}
+        else:
+            now = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.000000Z')
+            score = {field: DEFAULTS[kind].get(field) if data.get(field) is None else data[field]
+                     for field in RULES[kind]}
+            score.update(id=self.next_id, created_at=now, updated_at=now)
+            self.next_id += 1
+            self.scores[kind].append(score)
+            answer = 201, score
+        if key:
+            self.answers[key] = answer
+        return answer
+
+    @staticmethod
+    def etag(payload):
+        return '"' + hashlib.sha1(json.dumps(payload).encode()).hexdigest()[:16] + '"'
+
+    @staticmethod
+    async def _answer(writer, status, payload, etag=None):
+        body = b'' if payload is None else json.dumps(payload).encode()
+        head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                + (f"ETag: {etag}\r\n" if etag else "")
+                + "Connection: keep-alive\r\n\r\n")
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local KeyScale leaderboard server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=0.0, help="Mean delay before each answer")
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help="Spread of the delay either way")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Share of requests answered 503")
+    parser.add_argument('--timeout-rate', type=float, default=0.0, help="Share of requests never answered")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--idempotent', action='store_true', help="Replay the first answer to a known Idempotency-Key")
+    args = parser.parse_args()
+
+    server = ScoreServer(args.host, args.port, args.latency_ms, args.jitter_ms, args.error_rate, args.timeout_rate,
+                         args.seed, args.idempotent)
+
+    async def serve():
+        await server.start()
+        print(f"Serving the leaderboard on {server.url}")
+        async with server.server:
+            await server.server.serve_forever()
+
+    start = time.perf_counter()
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        print(f"Stopped after {time.perf_counter() - start:.0f}s: {dict(server.counts)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,27 @@
 import pygame
-import numpy as np
-from PIL import Image
 import threading
 import time
 
+from model.AssetManager import assets
+from model.FrameCache import frame_cache
+from model.GifDecoder import GifDecoder
+from model.TextRenderer import text_renderer
+
 
 class Animation:
-    def __init__(self, filepath, screen_width, screen_height, skip_fade_in=False):
+    """
+    Death animation played from a GIF, with fade-in and fade-out.
+    Frames are decoded by GifDecoder and kept at the GIF resolution, 8-bit with their palette. The frame
+    on screen is scaled once into a reusable full-screen target, which is then blitted with the fade alpha.
+    By default every frame is decoded before playback starts. In streaming mode a producer thread decodes
+    frames ahead of the playhead into a ring buffer of at most buffer_frames surfaces, and playback starts
+    as soon as the first one is ready. loading_complete means the animation can be played in both modes.
+    A full load can hand the decoding to worker processes so it does not hold the GIL the game loop needs.
+    Cue points call back from update() when playback reaches a frame, they last for one playback.
+    """
+
+    def __init__(self, filepath, screen_width, screen_height, skip_fade_in=False, stream=False, buffer_frames=8,
+                 debug=False, processes=0):
         self.frames = []
         self.current_frame = 0
         self.frame_count = 0
@@ -28,59 +43,136 @@ class Animation:
         self.screen_height = screen_height
         self.filepath = filepath
         self.skip_fade_in = skip_fade_in
-
+        self.debug = debug  # Frame, alpha and loop counters drawn over the animation
+        self.background = (255, 255, 255)  # Shown through the transparent pixels of the GIF
+
+        # Full-screen surfaces reused for every frame, the target holds the scaled frame on screen
+        self.target = None
+        self.scaled = None
+        self.target_source = None
+        self.transparency = None  # Palette index of the transparent pixels
+
+        # Streaming mode: frames by playback position, from the playhead to buffer_frames ahead of it
+        self.stream = stream
+        self.buffer_frames = max(2, buffer_frames)
+        self.buffer = {}
+        self.buffer_changed = threading.Condition()
+        self.decoding_done = False
+        self.stopped = False
+        self.stalls = 0  # Updates where the producer was behind the playhead
+
+        # Worker processes decoding the frames of a full load, 0 decodes in the loading thread
+        self.processes = processes
+
+        # Time from start() to the first frame on screen, in seconds
+        self.started_at = None
+        self.first_frame_latency = None
+        self.latency_log = None  # List the latency is appended to, shared by a pool
+
+        # [position, callback, fired] with position a frame index or a fraction of the animation
+        self.cues = []
+
+        self._start_loading()
+
+    def _start_loading(self):
         # Start loading thread
-        self.loading_thread = threading.Thread(target=self._load_gif_thread)
+        self.loading_thread = threading.Thread(target=self._load_gif_thread, daemon=self.stream)
         self.loading_thread.start()
-        print(f"Started loading animation from {filepath} in background thread")
+        print(f"Started loading animation from {self.filepath} in background thread")
+
+    def start(self, skip_fade_in=None):
+        """Rewind the animation so it plays from the first frame again, without loading it again"""
+        if skip_fade_in is not None:
+            self.skip_fade_in = skip_fade_in
+        # A streamed animation already gave its frames away, the producer starts over
+        restart = self.stream and not self.frames and (self.playhead > 0 or self.stopped or self.decoding_done)
+
+        self.current_frame = 0
+        self.delay_counter = 0
+        self.done = False
+        self.alpha = 255 if self.skip_fade_in else 0
+        self.fade_in = not self.skip_fade_in
+        self.complete_loops = 0
+        self.fade_out_started = False
+        self.displayed_frames = 0
+        self.stalls = 0
+        self.started_at = time.perf_counter()
+        self.first_frame_latency = None
+        self.cues = []
+
+        if restart:
+            self.stop()
+            self.loading_thread.join()
+            self.stopped = False
+            self.decoding_done = False
+            self.loading_complete = False
+            self._start_loading()
+
+    @property
+    def playhead(self):
+        """Playback position, counting the frames of the previous loops"""
+        return self.complete_loops * self.frame_count + self.current_frame
+
+    def add_cue(self, position, callback):
+        """
+        Call callback once playback reaches position: a frame index (int) or a fraction of the frames (float).
+        Cues fire from update(), on the thread running the game loop, and are dropped by start().
+        """
+        self.cues.append([position, callback, False])
+
+    def _cue_frame(self, position):
+        if isinstance(position, float):
+            return min(self.frame_count - 1, int(self.frame_count * position))
+        return position
+
+    def _fire_cues(self):
+        for cue in self.cues:
+            if not cue[2] and self.playhead >= self._cue_frame(cue[0]):
+                cue[2] = True
+                try:
+                    cue[1]()
+                except Exception as e:
+                    print(f"Animation cue at {cue[0]} failed: {e}")
+
+    def _set_timing(self, duration):
+        if duration:
+            self.frame_delay = max(2, int(duration / 33))
+            print(f"Setting frame delay to {self.frame_delay} based on GIF duration")
+        else:
+            self.frame_delay = 2
+
+        # Ensure minimum display time is adequate
+        self.min_display_frames = max(60, self.frame_count * 2)
 
     def _load_gif_thread(self):
         """Thread function to load GIF animation frames"""
         try:
-            # Set thread priority higher
-            import os
-            try:
-                os.nice(-10)
-            except (OSError, AttributeError):
-                pass
-
-            gif = Image.open(self.filepath)
-            temp_frames = []
-            frame_count = 0
-
-            try:
-                while True:
-
-                    frame = gif.convert("RGBA")
-
-
-                    frame_data = frame.tobytes()
-                    frame_size = frame.size
-                    pygame_frame = pygame.image.fromstring(frame_data, frame_size, "RGBA")
-
-
-                    scaled_frame = pygame.transform.scale(pygame_frame, (self.screen_width, self.screen_height))
-                    temp_frames.append(scaled_frame)
-
-                    # Move to next frame
-                    frame_count += 1
-                    gif.seek(gif.tell() + 1)
-
-            except EOFError:
-                # End of sequence
-                pass
-
-            self.frame_count = frame_count
-            self.frames = temp_frames
-
-            if hasattr(gif, 'info') and 'duration' in gif.info:
-                self.frame_delay = max(2, int(gif.info['duration'] / 33))
-                print(f"Setting frame delay to {self.frame_delay} based on GIF duration")
+            decoder = GifDecoder(self.filepath)
+            self.transparency = decoder.transparency
+            cached = frame_cache.load(self.filepath, decoder.size)
+            if cached is not None:
+                # Already decoded by a previous run, the frames come straight from the mapped file
+                temp_frames, info = cached
+                duration = info.get('duration')
+            elif self.stream:
+                self._stream_frames(decoder)
+                return
             else:
-                self.frame_delay = 2
-
-            # Ensure minimum display time is adequate
-            self.min_display_frames = max(60, self.frame_count * 2)
+                # Every frame lands in one array, the surfaces are views into it
+                temp_frames = []
+                writer = frame_cache.writer(self.filepath, decoder.size, decoder.pixel_format)
+                for pixels in decoder.frames(processes=self.processes):
+                    temp_frames.append(decoder.to_surface(pixels))
+                    if writer is not None:
+                        writer.add(temp_frames[-1])
+                duration = decoder.duration
+                if writer is not None:
+                    writer.commit({'duration': duration, 'colorkey': self.transparency})
+                print(f"Decoded {self.filepath}: {decoder.timing_summary()}")
+
+            self.frame_count = len(temp_frames)
+            self.frames = temp_frames
+            self._set_timing(duration)
 
             print(f"Loaded {self.frame_count} frames from {self.filepath}")
             self.loading_complete = True
@@ -91,10 +183,67 @@ class Animation:
             self.loading_complete = True  # Mark as complete even on error
             self.done = True  # Mark animation as done to avoid displaying incomplete content
 
+    def _stream_frames(self, decoder):
+        """Producer: decode frames ahead of the playhead, waiting while the ring buffer is full"""
+        self.frame_count = decoder.frame_count
+        self._set_timing(decoder.duration)
+        # The first loop is written to the frame cache as it is decoded, the next death loads it from there
+        writer = frame_cache.writer(self.filepath, decoder.size, decoder.pixel_format)
+
+        try:
+            for loop in range(self.max_loops):
+                # Frames are composited in order, each loop decodes the GIF again
+                for index, pixels in enumerate(decoder.frames(keep_all=False)):
+                    position = loop * self.frame_count + index
+                    surface = decoder.to_surface(pixels)
+                    if writer is not None:
+                        writer.add(surface)
+                        if index == self.frame_count - 1:
+                            writer.commit({'duration': decoder.duration, 'colorkey': self.transparency})
+                            writer = None
+
+                    with self.buffer_changed:
+                        while not self.stopped and position >= self.playhead + self.buffer_frames:
+                            self.buffer_changed.wait()
+                        if self.stopped:
+                            return
+                        self.buffer[position] = surface
+                    self.loading_complete = True
+                print(f"Decoded {self.filepath}: {decoder.timing_summary()}")
+        finally:
+            if writer is not None:
+                writer.abort()
+            self.decoding_done = True
+
+    def _frame_ready(self, position):
+        if self.frames or not self.stream or position >= self.frame_count * self.max_loops:
+            return True
+        return position in self.buffer or self.decoding_done
+
+    def _release_frames(self):
+        """Drop the streamed frames behind the playhead and let the producer decode further"""
+        with self.buffer_changed:
+            for position in [position for position in self.buffer if position < self.playhead]:
+                del self.buffer[position]
+            self.buffer_changed.notify_all()
+
+    def current_surface(self):
+        if self.frames:
+            return self.frames[self.current_frame] if self.current_frame < len(self.frames) else None
+        return self.buffer.get(self.playhead)
+
+    def stop(self):
+        """Stop the streaming producer, e.g. when the animation is abandoned"""
+        with self.buffer_changed:
+            self.stopped = True
+            self.buffer.clear()
+            self.buffer_changed.notify_all()
+
     def update(self):
         # If still loading, don't update animation state
-        if not self.loading_complete or len(self.frames) == 0:
+        if not self.loading_complete or self.frame_count == 0:
             return
+        self._fire_cues()  # Cues on the first frame
 
         # First handle fade-in
         if self.fade_in and self.alpha < 255:
@@ -111,12 +260,17 @@ class Animation:
         # Process animation frames
         self.delay_counter += 1
         if self.delay_counter >= self.frame_delay:
+            if not self._frame_ready(self.playhead + 1):
+                # The producer is behind, hold the current frame until the next one is decoded
+                self.stalls += 1
+                return
+
             self.delay_counter = 0
             self.current_frame += 1
 
-            if self.current_frame >= len(self.frames):
+            if self.current_frame >= self.frame_count:
                 if self.complete_loops >= self.max_loops - 1:
-                    self.current_frame = len(self.frames) - 1
+                    self.current_frame = self.frame_count - 1
 
                     # Only start fade-out if minimum display time has passed
                     if self.displayed_frames >= self.min_display_frames:
@@ -125,94 +279,67 @@ class Animation:
                     self.current_frame = 0
                     self.complete_loops += 1
 
+            if self.stream:
+                self._release_frames()
+
+            self._fire_cues()
+
         # Handle fade-out only after minimum display time
         if self.fade_out_started:
             self.alpha -= self.fade_speed
             if self.alpha <= 0:
                 self.alpha = 0
                 self.done = True
+                self.stop()
 
     def draw(self, screen):
         # If still loading or no frames, show loading indicator
-        if not self.loading_complete or len(self.frames) == 0:
+        if not self.loading_complete or self.frame_count == 0:
             if self.loading_error:
-                error_font = pygame.font.Font(None, 24)
-                error_text = error_font.render(f"Error: {self.loading_error}", True, (255, 0, 0))
+                error_text = text_renderer.render(f"Error: {self.loading_error}", 24, (255, 0, 0))
                 screen.blit(error_text, (10, 40))
             else:
-                loading_font = pygame.font.Font(None, 36)
-                loading_text = loading_font.render("Loading animation...", True, (255, 255, 255))
+                loading_text = text_renderer.render("Loading animation...", 36, (255, 255, 255))
                 screen.blit(loading_text, (self.screen_width // 2 - loading_text.get_width() // 2,
                                            self.screen_height // 2 - loading_text.get_height() // 2))
             return
 
-        if self.current_frame >= len(self.frames):
+        surface = self.current_surface()
+        if surface is None:
             return
 
-        frame_copy = self.frames[self.current_frame].copy()
-        frame_copy.set_alpha(self.alpha)
-
-        screen.blit(frame_copy, (0, 0))
-
-        debug_font = pygame.font.Font(None, 24)
-        debug_info = f"Frame: {self.current_frame + 1}/{self.frame_count} | Alpha: {self.alpha} | Loops: {self.complete_loops}/{self.max_loops}"
-        debug_text = debug_font.render(debug_info, True, (255, 255, 255))
-        screen.blit(debug_text, (10, 10))
-
-    def load_gif(self, filepath, screen_width, screen_height):
-        """Load and process GIF animation frames"""
-        try:
-            # Open the GIF file with PIL
-            gif = Image.open(filepath)
-
-            # Reset frame lists
-            self.frames = []
-
-            # Process all frames
-            frame_count = 0
-
-            # Iterate through all frames
-            try:
-                while True:
-                    # Convert to RGBA
-                    frame = gif.convert("RGBA")
-
-                    # Convert PIL image to Pygame surface
-                    frame_data = frame.tobytes()
-                    frame_size = frame.size
-                    pygame_frame = pygame.image.fromstring(frame_data, frame_size, "RGBA")
-
-                    # Scale the image to fit the screen
-                    scaled_frame = pygame.transform.scale(pygame_frame, (screen_width, screen_height))
-                    self.frames.append(scaled_frame)
-
-                    # Move to next frame
-                    frame_count += 1
-                    gif.seek(gif.tell() + 1)
-
-            except EOFError:
-                # End of sequence
-                pass
-
-            self.frame_count = frame_count
-            print(f"Loaded {self.frame_count} frames from {filepath}")
-
-            # Set appropriate frame delay - use a minimum of 3 to ensure animation is visible
-            if hasattr(gif, 'info') and 'duration' in gif.info:
-                # Convert from ms to frames but ensure it's not too quick
-                self.frame_delay = max(3, int(gif.info['duration'] / 33))
-                print(f"Setting frame delay to {self.frame_delay} based on GIF duration")
-            else:
-                # Default to a reasonable speed if no duration info
-                self.frame_delay = 3
-
-            # Increase the number of loops to ensure animation is visible
-            self.max_loops = 2
-
-            # Ensure minimum display time is adequate
-            self.min_display_frames = max(60, self.frame_count * 2)
-
-            return True
-        except Exception as e:
-            print(f"Error loading GIF: {e}")
-            return False
\ No newline at end of file
+        if surface is not self.target_source:
+            self._scale_to_target(surface)
+        # Fully opaque frames skip blending, SDL blits a surface alpha of 255 on a much slower path
+        self.target.set_alpha(self.alpha if self.alpha < 255 else None)
+        screen.blit(self.target, (0, 0))
+
+        if self.started_at is not None and self.first_frame_latency is None:
+            self.first_frame_latency = time.perf_counter() - self.started_at
+            if self.latency_log is not None:
+                self.latency_log.append(self.first_frame_latency)
+            print(f"First animation frame shown {self.first_frame_latency * 1000:.1f} ms after start")
+
+        if self.debug:
+            debug_info = f"Frame: {self.current_frame + 1}/{self.frame_count} | Alpha: {self.alpha} | Loops: {self.complete_loops}/{self.max_loops}"
+            debug_text = text_renderer.render(debug_info, 24, (255, 255, 255))
+            screen.blit(debug_text, (10, 10))
+
+    def _scale_to_target(self, surface):
+        """Scale a native frame into the reusable full-screen target, once per displayed frame"""
+        size = (self.screen_width, self.screen_height)
+        if self.target is None:
+            self.target = assets.prepare(pygame.Surface(size))
+        if surface.get_bitsize() == 8:
+            # Scaled into a reusable 8-bit surface, it takes the palette of the frame
+            if self.scaled is None:
+                self.scaled = pygame.Surface(size, 0, 8)
+            self.scaled.set_palette(surface.get_palette())
+            self.scaled.set_colorkey(self.transparency)
+            pygame.transform.scale(surface, size, self.scaled)
+            scaled = self.scaled
+        else:
+            scaled = pygame.transform.scale(surface, size)
+        self.target.fill(self.background)
+        self.target.blit(scaled, (0, 0))
+        self.target_source = surface
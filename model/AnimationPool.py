@@ -0,0 +1,53 @@
+# model/AnimationPool.py
+from model.Animation import Animation
+
+
+class AnimationPool:
+    """
+    Keeps one Animation per GIF, loaded in the background before it is needed and rewound
+    for every new death instead of being decoded again. Also records how long each death
+    took to show its first frame.
+    """
+
+    def __init__(self, width, height, stream=False, buffer_frames=8, debug=False, processes=0):
+        self.width = width
+        self.height = height
+        self.stream = stream
+        self.buffer_frames = buffer_frames
+        self.debug = debug
+        self.processes = processes
+        self.animations = {}
+        self.latencies = []
+
+    def _create(self, filename):
+        animation = Animation(f'./ressources/{filename}', self.width, self.height,
+                              stream=self.stream, buffer_frames=self.buffer_frames, debug=self.debug,
+                              processes=self.processes)
+        animation.latency_log = self.latencies
+        self.animations[filename] = animation
+        return animation
+
+    def warm(self, filenames):
+        """Start loading the animations not loaded yet"""
+        for filename in filenames:
+            animation = self.animations.get(filename)
+            if animation is None or animation.loading_error:
+                self._create(filename)
+
+    def acquire(self, filename, skip_fade_in=False):
+        """Return the animation rewound to its first frame, loading it now if it was not warmed"""
+        animation = self.animations.get(filename)
+        if animation is None or animation.loading_error:
+            animation = self._create(filename)
+        animation.start(skip_fade_in)
+        return animation
+
+    def stats(self):
+        if not self.latencies:
+            return {'deaths': 0}
+        return {
+            'deaths': len(self.latencies),
+            'last_ms': self.latencies[-1] * 1000,
+            'mean_ms': sum(self.latencies) / len(self.latencies) * 1000,
+            'max_ms': max(self.latencies) * 1000,
+        }
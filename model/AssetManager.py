@@ -0,0 +1,99 @@
+# model/AssetManager.py
+import os
+import time
+
+import pygame
+
+# Every image the game needs, loaded up front by preload(). Sounds are loaded by the SoundBank
+SCREEN_IMAGES = ['./ressources/background.jpg', './ressources/menu.jpg', './ressources/lava.jpg',
+                 './ressources/rocks/rock1.jpeg', './ressources/rocks/rock2.jpeg',
+                 './ressources/rocks/rock3.jpeg', './ressources/rocks/rock4.jpeg']
+SPRITE_IMAGES = ['./ressources/climbing-man-1.png', './ressources/climbing-man-2.png']
+
+
+class AssetManager:
+    """
+    Loads every image and sound once and hands out shared handles.
+    Images are converted to the display pixel format and cached per requested size,
+    so each (path, size) pair is decoded and scaled a single time per resolution.
+    """
+
+    def __init__(self):
+        self.images = {}
+        self.sounds = {}
+        self.load_times = {}
+
+    @staticmethod
+    def _key(path):
+        return os.path.normpath(path)
+
+    @staticmethod
+    def prepare(surface, alpha=False):
+        """Convert a surface to the display pixel format when a display exists"""
+        if pygame.display.get_surface() is None:
+            return surface
+        return surface.convert_alpha() if alpha else surface.convert()
+
+    def image(self, path, size=None, alpha=False):
+        """Return the image at path, scaled to size if given, loading it on first use"""
+        key = (self._key(path), tuple(size) if size else None, alpha)
+        surface = self.images.get(key)
+        if surface is None:
+            start = time.perf_counter()
+            surface = pygame.image.load(path)
+            if size:
+                surface = pygame.transform.scale(surface, key[1])
+            surface = self.prepare(surface, alpha)
+            self.images[key] = surface
+            self.load_times[key] = time.perf_counter() - start
+        return surface
+
+    def sound(self, path):
+        """Return the decoded sound at path, loading it on first use"""
+        key = self._key(path)
+        sound = self.sounds.get(key)
+        if sound is None:
+            start = time.perf_counter()
+            sound = pygame.mixer.Sound(path)
+            self.sounds[key] = sound
+            self.load_times[key] = time.perf_counter() - start
+        return sound
+
+    def preload(self, width, height):
+        """Load and scale every known asset for the given resolution"""
+        start = time.perf_counter()
+        for path in SCREEN_IMAGES:
+            self.image(path, (width, height))
+        for path in SPRITE_IMAGES:
+            self.image(path, alpha=True)
+        print(f"Preloaded assets in {time.perf_counter() - start:.2f}s "
+              f"({self.memory_usage() / (1024 * 1024):.1f} MB)")
+
+    def image_bytes(self):
+        return sum(surface.get_bytesize() * surface.get_width() * surface.get_height()
+                   for surface in self.images.values())
+
+    def sound_bytes(self):
+        mixer = pygame.mixer.get_init()
+        if not mixer:
+            return 0
+        frequency, size, channels = mixer
+        return int(sum(sound.get_length() * frequency * channels * abs(size) // 8
+                       for sound in self.sounds.values()))
+
+    def memory_usage(self):
+        return self.image_bytes() + self.sound_bytes()
+
+    def stats(self):
+        return {
+            'images': len(self.images),
+            'sounds': len(self.sounds),
+            'image_bytes': self.image_bytes(),
+            'sound_bytes': self.sound_bytes(),
+            'load_time': sum(self.load_times.values()),
+            'load_times': {str(key): duration for key, duration in self.load_times.items()},
+        }
+
+
+# Shared instance, every model gets its surfaces and sounds from here
+assets = AssetManager()
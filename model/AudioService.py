@@ -0,0 +1,113 @@
+# model/AudioService.py
+import itertools
+import queue
+import threading
+
+import pygame
+
+from model.MusicController import MusicController
+
+# Lower numbers are served first and may take a channel from a less important sound
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+# Mixer channels kept for each sound group, pygame never hands them to anyone else
+RESERVED_CHANNELS = {'effects': 4, 'music': 2}
+
+
+class AudioService:
+    """
+    Plays every sound and music track of a SoundBank from one worker thread.
+    Callers only put a command on a priority queue, so nothing on the input path creates a thread,
+    loads a file or waits on the mixer. Effects play on a fixed set of reserved mixer channels,
+    a busy group gives the channel of its least important sound to a more important one.
+    Music goes through a MusicController on the two music channels, crossfading between tracks.
+    """
+
+    def __init__(self, bank, reserved=RESERVED_CHANNELS):
+        self.bank = bank
+        self.music_controller = None  # Created with the reserved channels
+        self.commands = queue.PriorityQueue()
+        self.order = itertools.count()  # Keeps commands of the same priority in call order
+        self.reserved = dict(reserved)
+        self.channels = {}  # Group -> list of [channel, priority of what it plays]
+        self.dropped = 0  # Effects skipped because every channel played something more important
+        self.worker = threading.Thread(target=self._run, daemon=True)
+        self.worker.start()
+
+    def play(self, sound_id, group=None, priority=PRIORITY_NORMAL):
+        """Queue a sound effect of the bank, on the channels of its own group unless another one is given"""
+        self._put(priority, '_play', sound_id, group or self.bank.group(sound_id), priority)
+
+    def music(self, track, fade_ms=None):
+        """Queue a music track of the bank, looped, crossfading with the previous one (fade_ms, default from settings)"""
+        self._put(PRIORITY_HIGH, '_music', track, fade_ms)
+
+    def prefetch_music(self, track):
+        """Queue the background loading of the track that is likely to play next"""
+        self._put(PRIORITY_LOW, '_prefetch_music', track)
+
+    def set_group_volume(self, group, volume):
+        """Volume from 0 to 1 of every sound of the group, applied to what is playing as well"""
+        self.bank.set_group_volume(group, volume)
+        self._put(PRIORITY_HIGH, '_apply_volume', group)
+
+    def _put(self, priority, command, *args):
+        self.commands.put((priority, next(self.order), command, args))
+
+    def _run(self):
+        while True:
+            _, _, command, args = self.commands.get()
+            try:
+                if pygame.mixer.get_init():
+                    getattr(self, command)(*args)
+            except Exception as e:
+                print(f"Audio error in {command}{args}: {e}")
+            finally:
+                self.commands.task_done()
+
+    def _reserve_channels(self):
+        total = sum(self.reserved.values())
+        if pygame.mixer.get_num_channels() < total:
+            pygame.mixer.set_num_channels(total)
+        pygame.mixer.set_reserved(total)
+        first = 0
+        for group, count in self.reserved.items():
+            self.channels[group] = [[pygame.mixer.Channel(index), None] for index in range(first, first + count)]
+            first += count
+        self.music_controller = MusicController(self.bank, [channel for channel, _ in self.channels['music']])
+
+    def _music_controller(self):
+        if self.music_controller is None:
+            self._reserve_channels()
+        return self.music_controller
+
+    def _free_slot(self, group, priority):
+        """Idle channel of the group, or the one playing the least important sound below priority"""
+        if not self.channels:
+            self._reserve_channels()
+        slots = self.channels.get(group) or self.channels['effects']
+        idle = [slot for slot in slots if not slot[0].get_busy()]
+        if idle:
+            return idle[0]
+        least = max(slots, key=lambda slot: PRIORITY_LOW if slot[1] is None else slot[1])
+        return least if least[1] >= priority else None
+
+    def _play(self, sound_id, group, priority):
+        sound = self.bank.sound(sound_id)  # Carries the volume of its group
+        slot = self._free_slot(group, priority)
+        if slot is None:
+            self.dropped += 1
+            return
+        slot[0].play(sound)
+        slot[1] = priority
+
+    def _music(self, track, fade_ms):
+        self._music_controller().play(track, fade_ms)
+
+    def _prefetch_music(self, track):
+        self._music_controller().prefetch(track)
+
+    def _apply_volume(self, group):
+        self._music_controller().apply_volume(group)
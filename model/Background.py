@@ -1,14 +1,18 @@
 # model/Background.py
 import pygame
 
+from model.AssetManager import assets
+
 class Background:
     def __init__(self, image_path, window_width, window_height):
-        self.original_image = pygame.image.load(image_path)
-        self.image1 = pygame.transform.scale(self.original_image.copy(), (window_width, window_height))
-        self.image2 = pygame.transform.scale(self.original_image.copy(), (window_width, window_height))
+        self.image_path = image_path
+        self.size = (window_width, window_height)
+        # Loaded on first draw so the scrolling logic also works without a display
+        self.image1 = None
+        self.image2 = None
 
-        self.rect1 = self.image1.get_rect()
-        self.rect2 = self.image2.get_rect()
+        self.rect1 = pygame.Rect(0, 0, window_width, window_height)
+        self.rect2 = pygame.Rect(0, 0, window_width, window_height)
 
         self.rect1.topleft = (0, 0)
         self.rect2.topleft = (0, -window_height)
@@ -27,5 +31,9 @@ class Background:
             self.rect2.bottom = self.rect1.top
 
     def draw(self, screen):
+        if self.image1 is None:
+            # Both halves of the scrolling background share the same scaled surface
+            self.image1 = assets.image(self.image_path, self.size)
+            self.image2 = self.image1
         screen.blit(self.image1, self.rect1)
         screen.blit(self.image2, self.rect2)
\ No newline at end of file
@@ -0,0 +1,25 @@
+# model/CacheFiles.py
+import hashlib
+import os
+import sys
+
+
+def user_cache_dir():
+    """Per-user cache folder of the platform, KEYSCALE_CACHE_DIR overrides it"""
+    if os.environ.get('KEYSCALE_CACHE_DIR'):
+        return os.environ['KEYSCALE_CACHE_DIR']
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA', os.path.expanduser('~'))
+        return os.path.join(base, 'KeyScale', 'Cache')
+    if sys.platform == 'darwin':
+        return os.path.expanduser('~/Library/Caches/KeyScale')
+    return os.path.join(os.environ.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache')), 'keyscale')
+
+
+def file_hash(path):
+    """Content hash of a source file, cached copies are keyed by it and follow its changes"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()[:24]
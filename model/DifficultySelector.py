@@ -1,12 +1,13 @@
 import pygame
 
+from model.TextRenderer import text_renderer
 
 class DifficultySelector:
     def __init__(self, x, y, width, height, difficulties, current_difficulty):
         self.rect = pygame.Rect(x, y, width, height)
         self.difficulties = difficulties
         self.current_index = difficulties.index(current_difficulty)
-        self.font = pygame.font.Font(None, 36)
+        self.font_size = 36
         self.left_arrow_rect = pygame.Rect(x - 30, y, 30, height)
         self.right_arrow_rect = pygame.Rect(x + width, y, 30, height)
 
@@ -15,12 +16,7 @@ class DifficultySelector:
 
         # Function to draw text with border
         def draw_text_with_border(text, x, y):
-            border_color = (255, 255, 255)  # White border color
-            screen.blit(self.font.render(text, True, border_color), (x - 2, y - 2))
-            screen.blit(self.font.render(text, True, border_color), (x + 2, y - 2))
-            screen.blit(self.font.render(text, True, border_color), (x - 2, y + 2))
-            screen.blit(self.font.render(text, True, border_color), (x + 2, y + 2))
-            screen.blit(self.font.render(text, True, (0, 0, 0)), (x, y))  # Main text
+            text_renderer.draw(screen, text, self.font_size, (0, 0, 0), (x, y), outline=(255, 255, 255))
 
         difficulty_text = self.difficulties[self.current_index]
         draw_text_with_border(difficulty_text, self.rect.x + 10, self.rect.y + 10)
@@ -0,0 +1,37 @@
+# model/DirtyRects.py
+import pygame
+
+
+class DirtyRects:
+    """
+    Collects the screen regions drawn during a frame and pushes only those to the display.
+    Regions from the previous frame are pushed too so that whatever moved away gets erased.
+    A full flip is used when disabled or when a frame asked for it (scrolling, full screen overlays...).
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.current = []
+        self.previous = []
+        self.full_frame = True
+
+    def add(self, rect):
+        if rect is not None:
+            self.current.append(pygame.Rect(rect))
+
+    def extend(self, rects):
+        for rect in rects:
+            self.add(rect)
+
+    def request_full(self):
+        self.full_frame = True
+
+    def present(self):
+        if not self.enabled or self.full_frame:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self.previous + self.current)
+
+        self.previous = self.current
+        self.current = []
+        self.full_frame = False
@@ -0,0 +1,165 @@
+# model/FrameCache.py
+import json
+import mmap
+import os
+import time
+
+import pygame
+
+from model.CacheFiles import file_hash, user_cache_dir
+
+CACHE_VERSION = 3
+# Byte order of the usual 32-bit display format on little-endian machines,
+# frames wrapped from the cache then blit without any conversion
+PIXEL_FORMAT = 'BGRA'
+BYTES_PER_PIXEL = {'P': 1, 'BGRA': 4, 'RGBA': 4}
+MAX_CACHE_MB = int(os.environ.get('KEYSCALE_CACHE_MAX_MB', '1024'))
+
+
+class FrameCache:
+    """
+    Decoded animation frames kept on disk as raw pixels, keyed by the GIF content hash and the frame size.
+    Frames are either 32-bit or 8-bit sharing one palette. A cached animation is memory-mapped and every
+    frame wrapped with pygame.image.frombuffer, so nothing is decoded again.
+    """
+
+    def __init__(self, directory=None, max_bytes=MAX_CACHE_MB * 1024 * 1024):
+        self.directory = directory or user_cache_dir()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.mapped = {}  # Open memory maps, they back the surfaces handed out
+
+    def _paths(self, path, size):
+        name = f"{file_hash(path)}_{size[0]}x{size[1]}"
+        base = os.path.join(self.directory, name)
+        return base + '.frames', base + '.json'
+
+    def load(self, path, size):
+        """Return (frames, info) for the animation at path with frames of the given size, or None on a cache miss"""
+        try:
+            data_path, info_path = self._paths(path, size)
+            with open(info_path, 'r') as file:
+                info = json.load(file)
+            pixel_format = info.get('format', PIXEL_FORMAT)
+            frame_bytes = size[0] * size[1] * BYTES_PER_PIXEL[pixel_format]
+            if info.get('version') != CACHE_VERSION or \
+                    os.path.getsize(data_path) != frame_bytes * info['frame_count']:
+                raise ValueError("stale cache entry")
+
+            mapped = self.mapped.get(data_path)
+            if mapped is None:
+                with open(data_path, 'rb') as file:
+                    mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                self.mapped[data_path] = mapped
+            view = memoryview(mapped)
+            frames = [pygame.image.frombuffer(view[i * frame_bytes:(i + 1) * frame_bytes], tuple(size), pixel_format)
+                      for i in range(info['frame_count'])]
+            if pixel_format == 'P':
+                for frame in frames:
+                    frame.set_palette(info['palette'])
+                    if info.get('colorkey') is not None:
+                        frame.set_colorkey(info['colorkey'])
+            os.utime(info_path)  # Most recently used entries survive pruning
+        except (OSError, ValueError, KeyError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return frames, info
+
+    def writer(self, path, size, pixel_format=PIXEL_FORMAT):
+        """Return a writer adding frames to a new entry one at a time, or None if the cache is not writable"""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            data_path, info_path = self._paths(path, size)
+            return _EntryWriter(self, path, data_path, info_path, pixel_format)
+        except OSError as e:
+            print(f"Could not write frame cache: {e}")
+            return None
+
+    def prune(self):
+        """Delete the least recently used entries once the cache grows past max_bytes"""
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.json'):
+                info_path = os.path.join(self.directory, name)
+                data_path = info_path[:-len('.json')] + '.frames'
+                size = os.path.getsize(data_path) if os.path.exists(data_path) else 0
+                entries.append((os.path.getmtime(info_path), size, info_path, data_path))
+        total = sum(entry[1] for entry in entries)
+        for _, size, info_path, data_path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if data_path in self.mapped:
+                continue
+            for stale in (info_path, data_path):
+                if os.path.exists(stale):
+                    os.remove(stale)
+            total -= size
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'directory': self.directory,
+                'mapped': len(self.mapped)}
+
+
+class _EntryWriter:
+    """Streams frames into a cache entry, written under temporary names and renamed on commit"""
+
+    def __init__(self, cache, source, data_path, info_path, pixel_format):
+        self.cache = cache
+        self.source = source
+        self.data_path = data_path
+        self.info_path = info_path
+        self.pixel_format = pixel_format
+        self.palette = None  # 8-bit entries only, every frame must share it
+        self.frame_count = 0
+        self.file = open(data_path + '.tmp', 'wb')
+
+    def add(self, frame):
+        if self.file is None:
+            return
+        if self.pixel_format == 'P':
+            palette = [tuple(color)[:3] for color in frame.get_palette()] if frame.get_bitsize() == 8 else None
+            if palette is None or (self.palette is not None and palette != self.palette):
+                print("Animation frames do not share one palette, they are not cached")
+                self.abort()
+                return
+            self.palette = palette
+        try:
+            self.file.write(pygame.image.tobytes(frame, self.pixel_format))
+            self.frame_count += 1
+        except (OSError, pygame.error) as e:
+            print(f"Could not write frame cache: {e}")
+            self.abort()
+
+    def commit(self, info):
+        if self.file is None:
+            return False
+        try:
+            self.file.close()
+            self.file = None
+            with open(self.info_path + '.tmp', 'w') as file:
+                json.dump(dict(info, version=CACHE_VERSION, frame_count=self.frame_count, format=self.pixel_format,
+                               palette=self.palette, source=os.path.basename(self.source), created=time.time()),
+                          file)
+            # A crash never leaves a half written entry behind
+            os.replace(self.data_path + '.tmp', self.data_path)
+            os.replace(self.info_path + '.tmp', self.info_path)
+            self.cache.prune()
+            return True
+        except OSError as e:
+            print(f"Could not write frame cache: {e}")
+            return False
+
+    def abort(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+            try:
+                os.remove(self.data_path + '.tmp')
+            except OSError:
+                pass
+
+
+# Shared instance, used by every Animation
+frame_cache = FrameCache()
@@ -0,0 +1,135 @@
+# model/FrameProfiler.py
+import contextlib
+import csv
+import time
+from collections import deque
+
+import pygame
+
+from model.TextRenderer import text_renderer
+
+PHASES = ['events', 'difficulty', 'obstacles', 'lava', 'draw_background', 'draw_obstacles',
+          'draw_player', 'draw_lava', 'draw_overlays', 'hud', 'flip']
+
+GRAPH_WIDTH = 240
+GRAPH_HEIGHT = 80
+GRAPH_SCALE_MS = 50  # Frame time shown at the top of the graph
+PERCENTILES_EVERY = 15  # Frames between two percentile refreshes
+
+
+class _Phase:
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.name, time.perf_counter_ns() - self.start)
+
+
+class FrameProfiler:
+    """
+    Records how long each phase of a frame takes with perf_counter_ns.
+    Phases measured several times in a frame (one per simulation step) are summed.
+    Recorded frames are streamed to a CSV file and can be shown as an on-screen overlay.
+    """
+
+    def __init__(self, enabled=False, csv_path='frame_profile.csv', budget_ms=1000 / 45):
+        self.enabled = enabled
+        self.csv_path = csv_path
+        self.budget_ms = budget_ms
+        self.frame = 0
+        self.current = dict.fromkeys(PHASES, 0)
+        self.frame_start = 0
+        self.totals = deque(maxlen=GRAPH_WIDTH)
+        self.history = {phase: deque(maxlen=GRAPH_WIDTH) for phase in PHASES}
+        self.percentiles = {}
+        self.csv_file = None
+        self.csv_writer = None
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        print(f"Frame profiler {'enabled' if self.enabled else 'disabled'}")
+
+    def measure(self, phase):
+        """Context manager timing one phase, free when the profiler is disabled"""
+        if not self.enabled:
+            return contextlib.nullcontext()
+        return _Phase(self, phase)
+
+    def add(self, phase, duration_ns):
+        self.current[phase] += duration_ns
+
+    def begin_frame(self):
+        self.frame_start = time.perf_counter_ns()
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        total = time.perf_counter_ns() - self.frame_start
+        self.frame += 1
+        self.totals.append(total)
+        for phase in PHASES:
+            self.history[phase].append(self.current[phase])
+        self._write_row(total)
+        self.current = dict.fromkeys(PHASES, 0)
+
+        if self.frame % PERCENTILES_EVERY == 0:
+            self.percentiles = {phase: self._percentiles(self.history[phase]) for phase in PHASES}
+            self.percentiles['total'] = self._percentiles(self.totals)
+
+    def _write_row(self, total):
+        if self.csv_writer is None:
+            self.csv_file = open(self.csv_path, 'w', newline='')
+            self.csv_writer = csv.writer(self.csv_file)
+            self.csv_writer.writerow(['frame', 'total_ns'] + [f"{phase}_ns" for phase in PHASES])
+        self.csv_writer.writerow([self.frame, total] + [self.current[phase] for phase in PHASES])
+
+    @staticmethod
+    def _percentiles(samples):
+        ordered = sorted(samples)
+        if not ordered:
+            return 0, 0, 0
+        last = len(ordered) - 1
+        return tuple(ordered[min(last, int(last * p))] / 1e6 for p in (0.5, 0.95, 0.99))
+
+    def draw(self, screen):
+        """Draw the rolling frame-time graph and phase percentiles, returning the touched rect"""
+        if not self.enabled:
+            return None
+
+        x = screen.get_width() - GRAPH_WIDTH - 10
+        y = screen.get_height() - GRAPH_HEIGHT - 10
+        area = pygame.Rect(x, y, GRAPH_WIDTH, GRAPH_HEIGHT)
+        pygame.draw.rect(screen, (0, 0, 0), area)
+
+        budget_y = area.bottom - int(self.budget_ms / GRAPH_SCALE_MS * GRAPH_HEIGHT)
+        pygame.draw.line(screen, (0, 160, 0), (area.left, budget_y), (area.right - 1, budget_y))
+        for i, total in enumerate(self.totals):
+            ms = total / 1e6
+            height = min(GRAPH_HEIGHT, int(ms / GRAPH_SCALE_MS * GRAPH_HEIGHT))
+            color = (255, 80, 80) if ms > self.budget_ms else (255, 255, 255)
+            pygame.draw.line(screen, color, (area.left + i, area.bottom - 1), (area.left + i, area.bottom - height))
+
+        # Percentile table in milliseconds, one row per phase, above the graph
+        rows = [('phase (ms)', 'p50', 'p95', 'p99')]
+        for phase in ['total'] + PHASES:
+            rows.append((phase,) + tuple(f"{value:.2f}" for value in self.percentiles.get(phase, (0, 0, 0))))
+        line_height = text_renderer.size('phase', 20)[1]
+        table = pygame.Rect(x, y - line_height * len(rows) - 5, GRAPH_WIDTH, line_height * len(rows))
+        pygame.draw.rect(screen, (0, 0, 0), table)
+        for i, row in enumerate(rows):
+            for column_x, cell in zip((4, 110, 155, 200), row):
+                text_renderer.draw(screen, cell, 20, (255, 255, 255), (table.x + column_x, table.y + i * line_height))
+        return area.union(table)
+
+    def close(self):
+        if self.csv_file is not None:
+            self.csv_file.close()
+            print(f"Frame profile written to {self.csv_path} ({self.frame} frames)")
+            self.csv_file = None
+            self.csv_writer = None
@@ -0,0 +1,281 @@
+# model/GifDecoder.py
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pygame
+from PIL import Image
+
+# Graphic control extension disposal methods
+DISPOSE_KEEP = 1
+DISPOSE_BACKGROUND = 2
+DISPOSE_PREVIOUS = 3
+
+_pools = {}
+
+
+def decode_pool(processes):
+    """Process pool shared by every decoder, created on first use"""
+    pool = _pools.get(processes)
+    if pool is None:
+        os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')  # Workers import pygame through this module
+        # Forking a process that runs SDL threads is unsafe, the workers start fresh
+        pool = ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context('spawn'))
+        _pools[processes] = pool
+    return pool
+
+
+def _decode_chunk(path, start, stop, memory_name, offsets):
+    """Worker: unpack the palette indices of frames start to stop into the shared memory block"""
+    decoder = GifDecoder(path)
+    memory = shared_memory.SharedMemory(name=memory_name)
+    try:
+        for index in range(start, stop):
+            indices = decoder._decode_indices(decoder.frames_info[index])
+            target = np.ndarray(indices.shape, np.uint8, memory.buf, offsets[index])
+            target[...] = indices
+            del target
+    finally:
+        memory.close()
+    return start, stop
+
+
+class _Frame:
+    __slots__ = ('x', 'y', 'width', 'height', 'interlace', 'bits', 'data', 'palette',
+                 'transparency', 'disposal', 'duration')
+
+
+class GifDecoder:
+    """
+    Decodes every frame of a GIF into one contiguous NumPy array.
+    The GIF blocks are parsed here, each frame's LZW data is unpacked by PIL's C decoder and the frames
+    are composited (transparency and disposal methods) with NumPy. When every frame uses the same palette
+    the frames stay 8-bit palette indices, otherwise they are composited as RGBA.
+    Frames are handed to pygame with frombuffer, the surfaces share the array memory.
+    With a process pool the LZW decoding, the slow part, runs in chunks of frames in other processes and comes
+    back through shared memory, only the compositing stays in the calling thread.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as file:
+            self.data = file.read()
+        self.frames_info = []
+        self._parse()
+
+        palettes = {frame.palette.tobytes() for frame in self.frames_info}
+        self.indexed = len(palettes) == 1
+        self.pixel_format = 'P' if self.indexed else 'RGBA'
+        first = self.frames_info[0]
+        self.palette = first.palette
+        self.palette_colors = [tuple(color) for color in self.palette.tolist()]  # As pygame takes it
+        self.transparency = first.transparency if self.indexed else None
+        self.duration = first.duration
+        self.pixels = None
+        self.decode_times = []
+        self.convert_times = []
+
+    @property
+    def size(self):
+        return self.width, self.height
+
+    @property
+    def frame_count(self):
+        return len(self.frames_info)
+
+    def _sub_blocks_end(self, position):
+        """Position right after the data sub-blocks starting at position"""
+        data = self.data
+        while data[position]:
+            position += data[position] + 1
+        return position + 1
+
+    def _parse(self):
+        data = self.data
+        if data[:3] != b'GIF':
+            raise ValueError(f"{self.path} is not a GIF file")
+        self.width = int.from_bytes(data[6:8], 'little')
+        self.height = int.from_bytes(data[8:10], 'little')
+        flags = data[10]
+        self.background = data[11]
+        position = 13
+        global_palette = None
+        if flags & 0x80:
+            length = 3 * (2 << (flags & 7))
+            global_palette = self._palette(data[position:position + length])
+            position += length
+
+        transparency, disposal, duration = None, 0, None
+        while position < len(data):
+            block = data[position]
+            if block == 0x3B:  # Trailer
+                break
+            if block == 0x21:  # Extension
+                label = data[position + 1]
+                if label == 0xF9:  # Graphic control extension
+                    packed = data[position + 3]
+                    disposal = (packed >> 2) & 7
+                    duration = int.from_bytes(data[position + 4:position + 6], 'little') * 10
+                    transparency = data[position + 6] if packed & 1 else None
+                position = self._sub_blocks_end(position + 2)
+            elif block == 0x2C:  # Image descriptor
+                frame = _Frame()
+                frame.x, frame.y, frame.width, frame.height = (
+                    int.from_bytes(data[position + i:position + i + 2], 'little') for i in (1, 3, 5, 7))
+                packed = data[position + 9]
+                frame.interlace = bool(packed & 0x40)
+                position += 10
+                frame.palette = global_palette
+                if packed & 0x80:
+                    length = 3 * (2 << (packed & 7))
+                    frame.palette = self._palette(data[position:position + length])
+                    position += length
+                if frame.palette is None:
+                    frame.palette = self._palette(bytes(range(256)) * 3)
+                frame.bits = data[position]
+                end = self._sub_blocks_end(position + 1)
+                frame.data = data[position + 1:end]
+                frame.transparency, frame.disposal, frame.duration = transparency, disposal, duration
+                self.frames_info.append(frame)
+                transparency, disposal, duration = None, 0, None
+                position = end
+            else:
+                raise ValueError(f"Unexpected block {block:#x} in {self.path}")
+        if not self.frames_info:
+            raise ValueError(f"{self.path} has no frames")
+
+    @staticmethod
+    def _palette(raw):
+        palette = np.zeros((256, 3), np.uint8)
+        colors = np.frombuffer(raw, np.uint8).reshape(-1, 3)[:256]
+        palette[:len(colors)] = colors
+        return palette
+
+    def _decode_indices(self, frame):
+        """Palette indices of one frame, unpacked by PIL's LZW decoder"""
+        try:
+            image = Image.frombytes('P', (frame.width, frame.height), frame.data, 'gif',
+                                    frame.bits, frame.interlace, -1)
+        except TypeError:
+            # Pillow before 9.5 takes no transparency argument
+            image = Image.frombytes('P', (frame.width, frame.height), frame.data, 'gif',
+                                    frame.bits, frame.interlace)
+        return np.asarray(image)
+
+    def _decode_in_pool(self, processes):
+        """Palette indices of every frame in order, decoded by the pool of processes workers into shared memory"""
+        pool = decode_pool(processes)
+        offsets = [0]
+        for frame in self.frames_info:
+            offsets.append(offsets[-1] + frame.width * frame.height)
+        memory = shared_memory.SharedMemory(create=True, size=max(1, offsets[-1]))
+        try:
+            chunk = max(4, math.ceil(self.frame_count / (processes * 2)))
+            futures = [pool.submit(_decode_chunk, self.path, start, min(start + chunk, self.frame_count),
+                                   memory.name, offsets)
+                       for start in range(0, self.frame_count, chunk)]
+            for future in futures:
+                start, stop = future.result()
+                for index in range(start, stop):
+                    frame = self.frames_info[index]
+                    yield np.ndarray((frame.height, frame.width), np.uint8, memory.buf, offsets[index])
+        finally:
+            memory.unlink()
+            try:
+                memory.close()
+            except BufferError:
+                pass  # A frame view is still alive, the block goes away with it
+
+    def frames(self, keep_all=True, processes=0):
+        """
+        Yield the composited frames one after another.
+        With keep_all they are views into self.pixels, one contiguous array holding every frame,
+        otherwise each frame is a copy that lives on its own (for streaming).
+        With processes above 0 the frames are decoded by that many other processes (see decode_pool).
+        """
+        height, width = self.height, self.width
+        count = self.frame_count
+        if self.indexed:
+            fill = self.transparency if self.transparency is not None else self.background
+            canvas = np.full((height, width), fill, np.uint8)
+            shape = (count, height, width)
+        else:
+            fill = 0
+            canvas = np.zeros((height, width, 4), np.uint8)
+            shape = (count, height, width, 4)
+        if keep_all:
+            self.pixels = np.empty(shape, np.uint8)
+
+        previous = None
+        saved = None
+        self.decode_times = []
+        decoded = self._decode_in_pool(processes) if processes > 0 else None
+        for index, frame in enumerate(self.frames_info):
+            start = time.perf_counter()
+
+            # Dispose of the previous frame before drawing this one
+            if previous is not None and previous.disposal == DISPOSE_BACKGROUND:
+                region = canvas[previous.y:previous.y + previous.height, previous.x:previous.x + previous.width]
+                region[...] = fill if previous.transparency is None or not self.indexed else previous.transparency
+            elif previous is not None and previous.disposal == DISPOSE_PREVIOUS and saved is not None:
+                canvas[...] = saved
+            if frame.disposal == DISPOSE_PREVIOUS:
+                saved = canvas.copy()
+
+            indices = next(decoded) if decoded is not None else self._decode_indices(frame)
+            # Frames may hang over the logical screen, only the visible part is drawn
+            visible_height = max(0, min(frame.height, height - frame.y))
+            visible_width = max(0, min(frame.width, width - frame.x))
+            indices = indices[:visible_height, :visible_width]
+            region = canvas[frame.y:frame.y + visible_height, frame.x:frame.x + visible_width]
+
+            if self.indexed:
+                if frame.transparency is None:
+                    region[...] = indices
+                else:
+                    np.copyto(region, indices, where=indices != frame.transparency)
+            else:
+                rgba = np.empty(indices.shape + (4,), np.uint8)
+                rgba[..., :3] = frame.palette[indices]
+                rgba[..., 3] = 255
+                if frame.transparency is None:
+                    region[...] = rgba
+                else:
+                    opaque = indices != frame.transparency
+                    np.copyto(region, rgba, where=opaque[..., None])
+            indices = None  # Views into the shared memory must be gone before it is closed
+
+            if keep_all:
+                self.pixels[index] = canvas
+                pixels = self.pixels[index]
+            else:
+                pixels = canvas.copy()
+            self.decode_times.append(time.perf_counter() - start)
+            previous = frame
+            yield pixels
+        if decoded is not None:
+            decoded.close()
+
+    def to_surface(self, pixels):
+        """Wrap a decoded frame in a pygame surface sharing its memory"""
+        start = time.perf_counter()
+        surface = pygame.image.frombuffer(pixels, self.size, self.pixel_format)
+        if self.indexed:
+            surface.set_palette(self.palette_colors)
+            if self.transparency is not None:
+                surface.set_colorkey(self.transparency)
+        self.convert_times.append(time.perf_counter() - start)
+        return surface
+
+    def timing_summary(self):
+        def describe(times):
+            if not times:
+                return "-"
+            return f"{sum(times) / len(times) * 1000:.2f} ms avg, {max(times) * 1000:.2f} ms max"
+
+        return (f"{self.frame_count} frames {self.width}x{self.height} ({self.pixel_format}): "
+                f"decode {describe(self.decode_times)}, convert {describe(self.convert_times)}")
@@ -0,0 +1,99 @@
+import math
+
+import pygame
+
+from model.Simulation import NB_VIES
+from model.TextRenderer import text_renderer
+
+
+class Hud:
+    """Lives and score drawn over the game, with the score pulsing for a moment after each point"""
+
+    def __init__(self):
+        self.previous_score = 0
+        self.score_animation = 0
+
+    def reset(self):
+        self.previous_score = 0
+        self.score_animation = 0
+
+    def update(self, simulation):
+        """Advance the score pulse by one simulation step"""
+        if simulation.score > self.previous_score:
+            self.score_animation = 10
+            self.previous_score = simulation.score
+
+        if self.score_animation > 0:
+            self.score_animation -= 0.5
+
+    def draw(self, screen, simulation):
+        """Draw lives and score, returning the rects that were touched"""
+        width = screen.get_width()
+        rects = []
+
+        circle_radius = 15
+        circle_spacing = 40
+        start_x = 20
+        start_y = 20
+
+
+        for i in range(NB_VIES):
+            circle_x = start_x + (i * circle_spacing) + circle_radius
+            circle_y = start_y + circle_radius
+
+            if i < simulation.lives:
+                gradient_color = (255, 100, 100)
+                rects.append(pygame.draw.circle(screen, gradient_color, (circle_x, circle_y), circle_radius))
+                pygame.draw.circle(screen, (255, 150, 150), (circle_x - 3, circle_y - 3), circle_radius - 5)
+            else:
+                rects.append(pygame.draw.circle(screen, (100, 100, 100), (circle_x, circle_y), circle_radius, 2))
+
+        score_size = 48 + self.score_animation
+
+        score_bg_width = 200
+        score_bg_height = 60
+        score_bg_rect = pygame.Rect(
+            width - score_bg_width - 10,
+            10,
+            score_bg_width,
+            score_bg_height
+        )
+
+
+        score_bg = pygame.Surface((score_bg_width, score_bg_height), pygame.SRCALPHA)
+        score_bg.fill((0, 0, 0, 100))
+        rects.append(screen.blit(score_bg, score_bg_rect))
+
+        if simulation.score < 100:
+            score_color = (255, 255, 255)
+        elif simulation.score < 500:
+            score_color = (255, 255, 0)
+        elif simulation.score < 1000:
+            score_color = (255, 165, 0)
+        else:
+            score_color = (255, 215, 0)
+
+        if self.score_animation > 0:
+            pulse = (math.sin(pygame.time.get_ticks() * 0.01) + 1) * 0.5
+            glow_intensity = int(100 * pulse)
+
+            if score_color[0] > 200:
+                glow_color = (200, 200, 255)
+            else:
+                glow_color = (255, 255, 255)
+
+
+            glow_text = text_renderer.render(f"Score: {simulation.score}", score_size, glow_color)
+            for offset in range(3, 0, -1):
+                rects.append(screen.blit(glow_text, (width - glow_text.get_width() - 20 + offset, 20 + offset)))
+
+
+        score_text = text_renderer.render(f"Score: {simulation.score}", score_size, score_color)
+
+
+        shadow_text = text_renderer.render(f"Score: {simulation.score}", score_size, (0, 0, 0))
+        rects.append(screen.blit(shadow_text, (width - score_text.get_width() - 19, 21)))
+
+
+        rects.append(screen.blit(score_text, (width - score_text.get_width() - 20, 20)))
+        return rects
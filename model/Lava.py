@@ -1,28 +1,36 @@
 import pygame
 
+from model.AssetManager import assets
+
 class Lava:
     def __init__(self, width, height, speed, image_path):
         # Position the lava at the bottom of the screen, visible
-        screen_height = pygame.display.Info().current_h
-        self.rect = pygame.Rect(0, screen_height - 50, width, 50)
+        self.screen_height = height
+        self.rect = pygame.Rect(0, self.screen_height - 50, width, 50)
         self.speed = speed
         self.moving_up = True
         self.target_position = self.rect.y
-        self.image = pygame.image.load(image_path)
-        self.original_image = self.image
+        self.previous_y = self.rect.y  # Position before the last simulation step, for interpolation
+        self.image_path = image_path
+        # Full screen height strip, only the visible part of it is blitted
+        self.strip = None
         self.start_delay = 0  # Default to 0 seconds
-        self.start_time = pygame.time.get_ticks()
+        self.delay_remaining = 0
         self.moving_enabled = False
 
     def set_start_delay(self, delay_seconds):
         self.start_delay = delay_seconds
-        self.start_time = pygame.time.get_ticks()
+        self.delay_remaining = delay_seconds
         self.moving_enabled = False
 
-    def update_position(self):
+    def update_position(self, dt):
+        """Advance the lava by one simulation step of dt seconds"""
+        self.previous_y = self.rect.y
         # Check if the delay period has passed
         if not self.moving_enabled:
-            if pygame.time.get_ticks() - self.start_time >= self.start_delay * 1000:
+            self.delay_remaining -= dt
+            if self.delay_remaining <= 0:
+                self.delay_remaining = 0
                 self.moving_enabled = True
                 return  # Don't move on the first frame when enabled
 
@@ -35,13 +43,11 @@ class Lava:
                 if self.rect.y <= 0:  # Prevent going above screen
                     self.rect.y = 0
                     self.moving_up = False
-                    self.target_position = pygame.display.Info().current_h - 50
+                    self.target_position = self.screen_height - 50
             else:
                 # Moving down logic
                 if self.rect.y < self.target_position:
                     self.rect.y += self.speed * 2  # Move down faster
-                    # Debug print
-                    print(f"Moving down: {self.rect.y}/{self.target_position}")
                 else:
                     # We've reached or passed the target position, switch direction
                     print("Reached target position, switching to moving up")
@@ -69,7 +75,7 @@ class Lava:
 
     def move_down(self, amount):
         current_y = self.rect.y
-        self.target_position = min(current_y + amount, pygame.display.Info().current_h - 50)
+        self.target_position = min(current_y + amount, self.screen_height - 50)
         self.moving_up = False
         self.moving_enabled = True  # Ensure movement is enabled
 
@@ -80,10 +86,18 @@ class Lava:
         self.speed += increment
 
     def reset_position(self):
-        self.rect.y = pygame.display.Info().current_h - 50
+        self.rect.y = self.screen_height - 50
         self.target_position = self.rect.y
+        self.previous_y = self.rect.y
+
+    def build_strip(self):
+        """Get the lava texture scaled to the full screen height, shared by every Lava instance"""
+        self.strip = assets.image(self.image_path, (self.rect.width, self.screen_height))
 
-    def draw(self, screen):
-        height = pygame.display.Info().current_h - self.rect.y
-        scaled_image = pygame.transform.scale(self.original_image, (self.rect.width, height))
-        screen.blit(scaled_image, (self.rect.x, self.rect.y))
\ No newline at end of file
+    def draw(self, screen, alpha=1.0):
+        if self.strip is None or self.strip.get_size() != (self.rect.width, self.screen_height):
+            self.build_strip()
+        # Interpolate between the last two simulation steps
+        y = int(self.previous_y + (self.rect.y - self.previous_y) * alpha)
+        height = self.screen_height - y
+        return screen.blit(self.strip, (self.rect.x, y), (0, 0, self.rect.width, height))
\ No newline at end of file
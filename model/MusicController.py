@@ -0,0 +1,97 @@
+# model/MusicController.py
+import os
+import threading
+
+import pygame
+
+# Length of the crossfade between two music tracks
+CROSSFADE_MS = int(os.environ.get('KEYSCALE_CROSSFADE_MS', '1500'))
+
+
+class MusicController:
+    """
+    Music tracks of a SoundBank played on two mixer channels, so the next track fades in while the
+    previous one fades out. Tracks are loaded by background threads, prefetch() gets the next one
+    ready before it is asked for and play() never waits on a file. Only the playing track and the
+    last prefetched one stay in memory.
+    """
+
+    def __init__(self, bank, channels, crossfade_ms=CROSSFADE_MS):
+        self.bank = bank
+        self.channels = channels  # Two reserved mixer channels, one of them plays the current track
+        self.crossfade_ms = crossfade_ms
+        self.fade_ms = crossfade_ms  # Of the crossfade in progress
+        self.active = 0
+        self.current = None
+        self.pending = None  # Track to start as soon as it is loaded
+        self.prefetched = None
+        self.loaded = {}
+        self.loading = {}
+        self.lock = threading.RLock()
+
+    def prefetch(self, track):
+        """Load a track in the background so play() can start it at once"""
+        with self.lock:
+            self.prefetched = track
+            if track in self.loaded or track in self.loading:
+                return
+            thread = threading.Thread(target=self._load, args=(track,), daemon=True)
+            self.loading[track] = thread
+            thread.start()
+
+    def _load(self, track):
+        try:
+            sound = self.bank.load_music(track)
+        except (pygame.error, FileNotFoundError) as e:
+            print(f"Error loading music {track}: {e}")
+            sound = None
+        with self.lock:
+            self.loading.pop(track, None)
+            if sound is not None:
+                self.loaded[track] = sound
+            if self.pending == track:
+                self._start(track)
+
+    def play(self, track, fade_ms=None):
+        """Crossfade to track, right away when it is loaded or as soon as its loading ends"""
+        with self.lock:
+            if track == self.current and self.channels[self.active].get_busy():
+                self.pending = None  # A track queued meanwhile is no longer wanted
+                return
+            self.pending = track
+            self.fade_ms = self.crossfade_ms if fade_ms is None else fade_ms
+            if track in self.loaded:
+                self._start(track)
+            else:
+                self.prefetch(track)
+
+    def _start(self, track):
+        self.pending = None
+        sound = self.loaded.get(track)
+        if sound is None:
+            return
+        previous = self.channels[self.active]
+        self.active = 1 - self.active
+        channel = self.channels[self.active]
+        channel.set_volume(self.bank.volumes[self.bank.group(track)])
+        channel.play(sound, loops=-1, fade_ms=self.fade_ms)
+        self._fade_out(previous, self.fade_ms)
+        self.current = track
+        # The channel fading out holds on to its sound until it stops
+        for name in [name for name in self.loaded if name not in (self.current, self.prefetched)]:
+            del self.loaded[name]
+
+    @staticmethod
+    def _fade_out(channel, fade_ms):
+        if not channel.get_busy():
+            return
+        if fade_ms:
+            channel.fadeout(fade_ms)
+        else:
+            channel.stop()
+
+    def apply_volume(self, group):
+        """Follow a volume change of the group when the playing track belongs to it"""
+        with self.lock:
+            if self.current is not None and self.bank.group(self.current) == group:
+                self.channels[self.active].set_volume(self.bank.volumes[group])
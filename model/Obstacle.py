@@ -1,17 +1,19 @@
-import pygame
 import random
 
+from model.ObstacleAtlas import obstacle_atlas
+
 AVAILABLE_KEYS = ["A", "S", "D", "W", "Z", "Q", "E", "R", "T", "Y", "U", "I", "O", "P", "F", "G", "H", "J", "K", "L",
                   "X", "C", "V", "B", "N", "M"]
 
 
 class Obstacle:
-    def __init__(self, width, is_trap, key, size, speed=5):
+    def __init__(self, width, is_trap, key, size, speed=5, x=None):
         self.width = width
         self.is_trap = is_trap
         self.key = key
         self.size = size
-        self.pos = [random.randint(0, width - size), -size]
+        self.pos = [x if x is not None else random.randint(0, width - size), -size]
+        self.previous_y = None  # Position before the last simulation step, for interpolation
         self.color = (255, 0, 0) if is_trap else (0, 0, 0)
         self.speed = speed
         self.speed = speed
@@ -22,10 +24,16 @@ class Obstacle:
 
     def move_down(self):
         if not self.tutorial and self.speed > 0:
+            self.previous_y = self.pos[1]
             self.pos[1] += self.speed
 
-    def draw(self, screen, font):
-        pygame.draw.rect(screen, self.color, (*self.pos, self.size, self.size))
-        text = font.render(self.key, True, (255, 255, 255))
-        text_rect = text.get_rect(center=(self.pos[0] + self.size // 2, self.pos[1] + self.size // 2))
-        screen.blit(text, text_rect)
\ No newline at end of file
+    def render_pos(self, alpha=1.0):
+        """Position interpolated between the last two simulation steps"""
+        if self.previous_y is None:
+            return self.pos
+        return self.pos[0], self.previous_y + (self.pos[1] - self.previous_y) * alpha
+
+    def draw(self, screen, font_size, alpha=1.0):
+        tile, (offset_x, offset_y) = obstacle_atlas.tile(self.key, self.is_trap, self.size, font_size)
+        x, y = self.render_pos(alpha)
+        return screen.blit(tile, (x + offset_x, y + offset_y))
\ No newline at end of file
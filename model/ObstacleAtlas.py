@@ -0,0 +1,69 @@
+# model/ObstacleAtlas.py
+import pygame
+
+from model.TextRenderer import text_renderer
+
+TRAP_COLOR = (255, 0, 0)
+REGULAR_COLOR = (0, 0, 0)
+LETTER_COLOR = (255, 255, 255)
+
+
+class ObstacleAtlas:
+    """
+    Pre-rendered obstacle tiles (colored square plus its letter) keyed by key, trap flag,
+    square size and font size. Every live obstacle is then drawn with a single Surface.blits call.
+    """
+
+    def __init__(self):
+        self.tiles = {}
+        self.square_size = None
+        self.font_size = None
+        self.rebuilds = 0
+
+    def configure(self, square_size, font_size):
+        """Drop the cached tiles when the obstacle or font size setting changed"""
+        square_size, font_size = int(square_size), int(font_size)
+        if (square_size, font_size) != (self.square_size, self.font_size):
+            self.tiles.clear()
+            self.square_size = square_size
+            self.font_size = font_size
+            self.rebuilds += 1
+
+    def tile(self, key, is_trap, square_size, font_size):
+        """Return (surface, offset) where offset is the tile position relative to the obstacle"""
+        tile_key = (key, is_trap, int(square_size), int(font_size))
+        tile = self.tiles.get(tile_key)
+        if tile is None:
+            tile = self._build_tile(*tile_key)
+            self.tiles[tile_key] = tile
+        return tile
+
+    @staticmethod
+    def _build_tile(key, is_trap, square_size, font_size):
+        text = text_renderer.render(key, font_size, LETTER_COLOR)
+
+        # Big fonts overflow the square, the tile grows so the letter is never clipped
+        width = max(square_size, text.get_width())
+        height = max(square_size, text.get_height())
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        square_x = (width - square_size) // 2
+        square_y = (height - square_size) // 2
+        pygame.draw.rect(surface, TRAP_COLOR if is_trap else REGULAR_COLOR,
+                         (square_x, square_y, square_size, square_size))
+        surface.blit(text, text.get_rect(center=(square_x + square_size // 2, square_y + square_size // 2)))
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        return surface, (-square_x, -square_y)
+
+    def draw_all(self, screen, obstacles, font_size, alpha=1.0):
+        """Blit every obstacle in one batch and return the touched rects"""
+        blit_sequence = []
+        for obstacle in obstacles:
+            surface, (offset_x, offset_y) = self.tile(obstacle.key, obstacle.is_trap, obstacle.size, font_size)
+            x, y = obstacle.render_pos(alpha)
+            blit_sequence.append((surface, (x + offset_x, y + offset_y)))
+        return screen.blits(blit_sequence)
+
+
+# Shared instance, configured from the settings by Game.apply_settings
+obstacle_atlas = ObstacleAtlas()
@@ -1,11 +1,11 @@
 # model/Player.py
-import pygame
+from model.AssetManager import assets
 
 class Player:
     def __init__(self, window_width, window_height):
         self.images = [
-            pygame.image.load('./ressources/climbing-man-1.png'),
-            pygame.image.load('./ressources/climbing-man-2.png'),
+            assets.image('./ressources/climbing-man-1.png', alpha=True),
+            assets.image('./ressources/climbing-man-2.png', alpha=True),
         ]
         self.current_image_index = 0
         self.image = self.images[self.current_image_index]
@@ -16,7 +16,7 @@ class Player:
         self.climbing_speed = 10  # Adjust the speed value
 
     def draw(self, screen):
-        screen.blit(self.image, self.rect)
+        return screen.blit(self.image, self.rect)
 
     def next_frame(self):
         self.current_image_index = (self.current_image_index + 1) % len(self.images)
@@ -0,0 +1,140 @@
+# model/ScoreSubmitter.py
+import json
+import os
+import queue
+import threading
+import time
+
+import pygame
+
+# Posted when a submission or a refresh is done, with the leaderboard in event.scores
+# and its age in seconds in event.age (None when it comes from the local file)
+SCORES_UPDATED = pygame.event.custom_type()
+# Time a pass over the outbox may take, so a submit never waits long behind it
+SYNC_TIME_BUDGET = 10
+# Seconds without a new pass after one where nothing went through
+SYNC_BACKOFF = 60
+
+
+class ScoreSubmitter:
+    """
+    Sends scores and fetches the leaderboard on a worker thread, so the game never waits on the network.
+    Jobs are queued by submit() and refresh(), every result comes back to the game loop as a
+    SCORES_UPDATED event carrying the scores, where they came from ('api', 'cache' while being revalidated,
+    'stale' when the revalidation failed or 'local'), their age and
+    whether the score was accepted by the server. A refresh posts the cached leaderboard at once, then the
+    current one when the background revalidation brings it.
+    Scores the server could not take wait in the ScoreAPI outbox, they are sent again once the server answers:
+    after a score goes through or the leaderboard is fetched, for SYNC_TIME_BUDGET seconds at most.
+    """
+
+    def __init__(self, score_api, scores_file):
+        self.score_api = score_api
+        self.scores_file = scores_file
+        self.jobs = queue.Queue()
+        self.sync_failed_at = None
+        self.worker = threading.Thread(target=self._run, daemon=True)
+        self.worker.start()
+
+    def submit(self, name, score, difficulty):
+        self.jobs.put(('submit', {"name": name, "score": score, "difficulty": difficulty}))
+
+    def refresh(self):
+        """Fetch the leaderboard again"""
+        self.jobs.put(('refresh', None))
+
+    def wait(self):
+        """Block until every queued job is done"""
+        self.jobs.join()
+
+    def _run(self):
+        while True:
+            job, entry = self.jobs.get()
+            try:
+                if job == 'submit':
+                    self._submit(entry)
+                elif job == 'sync':
+                    self._sync()
+                else:
+                    self._refresh()
+            except Exception as e:
+                print(f"Error updating high scores: {e}")
+            finally:
+                self.jobs.task_done()
+
+    def _post(self, scores, source, submitted=None):
+        age = None if source == 'local' else self.score_api.leaderboard_status('game')['age']
+        try:
+            pygame.event.post(pygame.event.Event(SCORES_UPDATED, scores=scores, source=source, submitted=submitted,
+                                                 age=age))
+        except pygame.error as e:
+            print(f"Could not deliver scores: {e}")  # pygame already quit
+
+    def _submit(self, entry):
+        try:
+            saved = self.score_api.save_game_score(**entry)
+        except Exception as e:
+            print(f"Could not save score: {e}")
+            saved = False
+        if saved:
+            self.sync_failed_at = None  # The server is reachable
+            self.jobs.put(('sync', None))  # After the leaderboard below is posted
+            try:
+                scores = self.score_api.revalidate('game')
+                print("Scores successfully retrieved from API")
+                self._post(scores, 'api', True)
+                return
+            except Exception as e:
+                print(f"Couldn't retrieve scores from API: {e}")
+            submitted = True
+        else:
+            submitted = False
+
+        scores = self._load_local()
+        scores.append(entry)
+        scores.sort(key=lambda x: x["score"] if isinstance(x, dict) else 0, reverse=True)
+        scores = scores[:10]
+        with open(self.scores_file, 'w') as file:
+            json.dump(scores, file)
+        self._post(scores, 'local', submitted)
+
+    def _sync(self):
+        """Send the scores left in the outbox, the server is reachable again"""
+        if self.sync_failed_at is not None and time.monotonic() - self.sync_failed_at < SYNC_BACKOFF:
+            return
+        if not self.score_api.outbox.pending():
+            return
+        results = self.score_api.sync_local_scores(time_budget=SYNC_TIME_BUDGET)
+        self.sync_failed_at = time.monotonic() if results['failed'] and not results['sent'] else None
+        print(f"Sent {results['sent']} queued scores, {results['remaining']} still waiting")
+
+    def _on_revalidated(self, scores, fresh):
+        """Background revalidation is done, with the current leaderboard or, when it failed, the cached one"""
+        if not fresh:
+            self._post(scores, 'stale')
+            return
+        self._post(scores, 'api')
+        self.jobs.put(('sync', None))  # The server answers again
+
+    def _refresh(self):
+        try:
+            scores = self.score_api.get_game_scores(on_update=self._on_revalidated)
+            status = self.score_api.leaderboard_status('game')
+        except Exception as e:
+            print(f"Failed to load scores from API: {e}")
+            self._post(self._load_local(), 'local')
+            return
+        if scores and status['age'] is not None:
+            print("Scores loaded from API" if not status['stale'] else "Scores loaded from cache, revalidating")
+            self._post(scores, 'cache' if status['stale'] else 'api')
+        else:
+            self._post(self._load_local(), 'local')
+        if not status['stale']:
+            # Just fetched, so the server answers. A stale cache syncs once its revalidation succeeds
+            self._sync()
+
+    def _load_local(self):
+        if not os.path.exists(self.scores_file):
+            return []
+        with open(self.scores_file, 'r') as file:
+            return json.load(file)
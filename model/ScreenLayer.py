@@ -0,0 +1,33 @@
+# model/ScreenLayer.py
+import pygame
+
+
+class ScreenLayer:
+    """
+    Static part of a screen composited once into a cached surface.
+    The layer is rebuilt only when the key passed to draw() changes, so callers
+    put in the key everything the static content depends on (player name, scores...).
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.surface = None
+        self.key = None
+        self.valid = False
+        self.builds = 0
+
+    def invalidate(self):
+        self.valid = False
+
+    def draw(self, screen, key, build):
+        """Blit the cached layer, calling build(surface) first if it is missing or out of date"""
+        if not self.valid or key != self.key:
+            if self.surface is None:
+                self.surface = pygame.Surface(self.size)
+                if pygame.display.get_surface() is not None:
+                    self.surface = self.surface.convert()
+            build(self.surface)
+            self.key = key
+            self.valid = True
+            self.builds += 1
+        return screen.blit(self.surface, (0, 0))
@@ -0,0 +1,307 @@
+# model/Simulation.py
+import random
+
+from model.Background import Background
+from model.Difficulty import Difficulty
+from model.FrameProfiler import FrameProfiler
+from model.Lava import Lava
+from model.Obstacle import Obstacle
+from model.Player import Player
+
+# Keys
+AVAILABLE_KEYS = ["A", "S", "D", "W", "Z", "Q", "E", "R", "T", "Y", "U", "I", "O", "P", "F", "G", "H", "J", "K", "L", "X", "C", "V", "B", "N", "M"]
+TAUX_PIEGES = 0.2
+NB_VIES = 4
+MAX_BLACK_SQUARES = 20  # Decreased from 30
+MAX_OBSTACLES = 20  # Set the maximum number of obstacles
+BLACK_SQUARE_SPAWN_RATE = 20  # Increased from 10
+LAVA_SPEED = 0.5
+TUTORIAL_WORD = "APPUYER!"
+COUNTDOWN_SECONDS = 3
+
+# Game rules advance in fixed steps, every speed in the game is expressed per step
+SIMULATION_RATE = 45
+SIMULATION_STEP = 1 / SIMULATION_RATE
+
+
+def load_difficulty(difficulty_name):
+    difficulties = {
+        'facile': Difficulty(
+            'facile',
+            obstacle_speed=2,
+            spawn_rate=50,  # Make letters appear more frequently on easy
+            lava_speed_increment=0.03,
+            lava_start_delay=10.0,  # 8 seconds delay before lava starts moving
+            initial_obstacles=10,  # Spawn 10 obstacles at the start
+            lava_speed=0.3  # Slower lava speed for easy difficulty
+        ),
+        'moyen': Difficulty(
+            'moyen',
+            obstacle_speed=4,
+            spawn_rate=50,
+            lava_speed_increment=0.07,
+            lava_start_delay=5.0,  # 5 seconds delay
+            initial_obstacles=8,
+            lava_speed=0.5  # Medium lava speed
+        ),
+        'difficile': Difficulty(
+            'difficile',
+            obstacle_speed=6,
+            spawn_rate=30,
+            lava_speed_increment=0.15,
+            lava_start_delay=2.0,  # 2 seconds delay
+            initial_obstacles=5,
+            lava_speed=0.8  # Faster lava speed for hard difficulty
+        )
+    }
+    return difficulties.get(difficulty_name, difficulties['moyen'])
+
+
+class Simulation:
+    """
+    Every game rule, without any display: obstacles, lava, player height, lives and score.
+    step(dt, keys) applies the pressed keys then advances by as many fixed steps as dt covers,
+    and returns what happened as a list of (event, value) tuples for the renderer to react to:
+    ('letter', key), ('trap', key), ('missed', key) and ('game_over', 'lives' | 'lava').
+    """
+
+    def __init__(self, width, height, difficulty_name='moyen', obstacle_size=30, seed=None):
+        self.width = width
+        self.height = height
+        self.obstacle_size = obstacle_size
+        self.rng = random.Random(seed)
+        self.profiler = FrameProfiler()  # Disabled unless the renderer shares its own
+        # The background scroll follows the player, it is kept from one game to the next
+        self.background = Background('./ressources/background.jpg', width, height)
+        self.reset(difficulty_name)
+
+    def reset(self, difficulty_name):
+        self.difficulty = load_difficulty(difficulty_name)
+        self.player = Player(self.width, self.height)
+        self.obstacles = []
+        self.available_keys = AVAILABLE_KEYS.copy()
+        self.score = 0
+        self.lives = NB_VIES
+        self.spawn_rate = self.get_initial_spawn_rate()
+        self.game_over = False
+        self.game_over_cause = None
+
+        self.lava = Lava(self.width, self.height, self.difficulty.lava_speed, "./ressources/lava.jpg")
+        self.lava.set_start_delay(self.difficulty.lava_start_delay)
+
+        self.tutorial_active = True
+        self.tutorial_letters = []
+        self.tutorial_completed = False
+        self.countdown_active = False
+        self.countdown_remaining = 0.0
+        self.create_tutorial()
+
+        self.accumulator = 0.0
+        self.ticks = 0
+        self.ticks_run = 0
+
+    @property
+    def interpolation(self):
+        """How far the simulation is between its last step and the next one, from 0 to 1"""
+        return self.accumulator / SIMULATION_STEP
+
+    def step(self, dt, keys=(), max_steps=None):
+        """Apply the pressed keys, then run every fixed step that dt seconds cover"""
+        events = []
+        for key in keys:
+            self.press_key(key, events)
+
+        self.accumulator += dt
+        steps = 0
+        while self.accumulator >= SIMULATION_STEP and (max_steps is None or steps < max_steps):
+            self.tick(events)
+            self.accumulator -= SIMULATION_STEP
+            steps += 1
+        if max_steps is not None and steps == max_steps:
+            self.accumulator = min(self.accumulator, SIMULATION_STEP)
+
+        self.ticks_run = steps
+        return events
+
+    def tick(self, events):
+        """Advance the game by one fixed simulation step"""
+        self.ticks += 1
+        if self.game_over:
+            return
+
+        if self.tutorial_active:
+            if self.countdown_active:
+                self.countdown_remaining -= SIMULATION_STEP
+                if self.countdown_remaining <= 0:
+                    self.countdown_active = False
+                    self.tutorial_active = False
+            return
+
+        with self.profiler.measure('difficulty'):
+            self.adjust_difficulty()
+            self.adjust_lava_speed()
+
+            if self.rng.randint(0, self.spawn_rate) == 0:
+                self.generate_obstacle()
+
+        with self.profiler.measure('obstacles'):
+            for obstacle in self.obstacles[:]:
+                obstacle.move_down()
+                if obstacle.pos[1] > self.height:
+                    self.obstacles.remove(obstacle)
+                    events.append(('missed', obstacle.key))
+
+                    if obstacle.pos[1] > self.lava.rect.top:
+                        self.lava.speed_up(self.difficulty.lava_speed_increment)
+
+                    if self.lives <= 0:
+                        self.end_game('lives', events)
+                        return
+
+        with self.profiler.measure('lava'):
+            self.lava.update_position(SIMULATION_STEP)
+        self.background.move(self.player.rect, self.height)
+
+        # Check if player has touched lava
+        if self.player.rect.bottom > self.lava.rect.top:
+            self.end_game('lava', events)
+
+    def end_game(self, cause, events):
+        self.game_over = True
+        self.game_over_cause = cause
+        events.append(('game_over', cause))
+
+    def press_key(self, key, events):
+        if self.game_over:
+            return
+        if self.tutorial_active:
+            self.handle_tutorial_key_press(key)
+        else:
+            self.handle_key_press(key, events)
+
+    def get_initial_spawn_rate(self):
+        if self.difficulty == 'facile':
+            return 70  # Increased from 50
+        elif self.difficulty == 'moyen':
+            return 50  # Increased from 30
+        elif self.difficulty == 'difficile':
+            return 30  # Increased from 20
+        else:
+            return 50  # Default value in case of an unknown difficulty
+
+    def adjust_difficulty(self):
+        # Adjust spawn rate based on score and distance to lava
+        distance_to_lava = self.player.rect.bottom - self.lava.rect.top
+        if self.score < 100:
+            self.spawn_rate = self.get_initial_spawn_rate()
+        elif self.score < 200:
+            self.spawn_rate = max(10, self.spawn_rate - 1)
+        else:
+            self.spawn_rate = max(5, self.spawn_rate - 1)
+
+        if distance_to_lava < 100:
+            self.spawn_rate = max(5, self.spawn_rate - 2)
+
+    def adjust_lava_speed(self):
+        base_lava_speed = 0.5
+        score_factor = self.score / 100
+
+        difficulty_multiplier = self.difficulty.lava_speed_increment
+
+        new_speed = base_lava_speed + (score_factor * difficulty_multiplier)
+
+        max_speed = 3.0
+        new_speed = min(new_speed, max_speed)
+
+        # Update lava speed
+        self.lava.speed = new_speed
+
+    def generate_obstacle(self):
+        if len(self.obstacles) >= MAX_OBSTACLES:
+            return
+
+
+        current_traps = sum(1 for obs in self.obstacles if obs.is_trap)
+        current_regular = sum(1 for obs in self.obstacles if not obs.is_trap)
+
+
+        force_regular = current_regular < 5 or current_traps > current_regular * 2
+
+
+        is_trap = self.rng.random() < TAUX_PIEGES and not force_regular
+
+
+        if is_trap and current_traps >= MAX_OBSTACLES // 3:
+            is_trap = False
+        elif not is_trap and current_regular >= MAX_BLACK_SQUARES:
+            return
+
+
+        available_keys = [key for key in self.available_keys
+                          if key not in [obs.key for obs in self.obstacles]]
+
+        if not available_keys:
+
+            self.available_keys = AVAILABLE_KEYS.copy()
+            available_keys = self.available_keys
+
+
+        key = self.rng.choice(available_keys)
+        self.available_keys.remove(key)
+        x = self.rng.randint(0, self.width - self.obstacle_size)
+        self.obstacles.append(Obstacle(self.width, is_trap, key,
+                                       self.obstacle_size, self.difficulty.obstacle_speed, x))
+
+    def spawn_initial_obstacles(self):
+        for _ in range(self.difficulty.initial_obstacles):
+            self.generate_obstacle()
+
+            if self.obstacles:
+                last_obstacle = self.obstacles[-1]
+                last_obstacle.pos[1] = self.rng.randint(100, self.height // 2)  # Place in upper half of screen
+
+    def create_tutorial(self):
+        letter_width = self.obstacle_size
+        total_width = len(TUTORIAL_WORD) * letter_width * 1.5  # 1.5 for spacing
+        start_x = (self.width - total_width) // 2
+
+        for i, letter in enumerate(TUTORIAL_WORD):
+            obstacle = Obstacle(self.width, False, letter, self.obstacle_size, 0)
+            obstacle.pos = [start_x + i * letter_width * 1.5, self.height // 3]
+            obstacle.tutorial = True
+            self.tutorial_letters.append(obstacle)
+
+    def handle_tutorial_key_press(self, key):
+        for obstacle in self.tutorial_letters[:]:
+            if key == obstacle.key:
+                self.tutorial_letters.remove(obstacle)
+
+                self.player.climb()
+
+                if not self.tutorial_letters:
+                    self.tutorial_completed = True
+                    self.countdown_active = True
+                    self.countdown_remaining = COUNTDOWN_SECONDS
+                return
+
+    def handle_key_press(self, key, events):
+        for obstacle in self.obstacles:
+            if key == obstacle.key:
+                if obstacle.is_trap:
+                    events.append(('trap', key))
+                    self.lives -= 1
+                else:
+                    events.append(('letter', key))
+                    self.score += 10
+                    self.player.climb()
+                    self.background.move(self.player.rect, self.height)
+
+                    # Use the lava's move_down method which is properly implemented
+                    down_amount = 100  # Adjust this value as needed
+                    self.lava.move_down(down_amount)
+
+                    # Ensure lava speed is properly adjusted
+                    self.adjust_lava_speed()
+
+                self.obstacles.remove(obstacle)
+                break
@@ -11,7 +11,13 @@ class Slider:
         self.dragging = False
 
     def draw(self, screen):
+        self.draw_track(screen)
+        self.draw_handle(screen)
+
+    def draw_track(self, screen):
         pygame.draw.rect(screen, (200, 200, 200), self.rect)
+
+    def draw_handle(self, screen):
         pygame.draw.rect(screen, (100, 100, 100), self.handle_rect)
 
     def handle_event(self, event):
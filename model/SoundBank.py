@@ -0,0 +1,111 @@
+# model/SoundBank.py
+import os
+import time
+import wave
+
+import pygame
+
+from model.AssetManager import assets
+from model.CacheFiles import file_hash, user_cache_dir
+
+GROUPS = ['menu_music', 'game_music', 'effects']
+# Sound id -> (file, group). Effects are decoded by load(), music tracks when the MusicController asks for them
+SOUNDS = {
+    'wrong_key': ('./ressources/wrong_key.mp3', 'effects'),
+    'faster': ('./ressources/faster.wav', 'effects'),
+    'death': ('./ressources/death.mp3', 'effects'),
+    'menu_musique1': ('./ressources/menu_musique1.mp3', 'menu_music'),
+    'menu_musique2': ('./ressources/menu_musique2.mp3', 'menu_music'),
+    'musique': ('./ressources/musique.mp3', 'game_music'),
+}
+# Keep a PCM copy (WAV) of every compressed sound, so it is never decoded again
+WAV_CACHE = os.environ.get('KEYSCALE_SOUND_CACHE', '1') == '1'
+
+
+class SoundBank:
+    """
+    Every sound of the game by id, sorted in volume groups.
+    Effects are decoded once by load() and carry the volume of their group, set for the whole group at once.
+    Compressed files are converted to WAV in the user cache folder the first time they are decoded,
+    so later runs and every music change read plain PCM instead of decoding MP3.
+    """
+
+    def __init__(self, sounds=SOUNDS, cache_dir=None, wav_cache=WAV_CACHE):
+        self.entries = dict(sounds)
+        self.cache_dir = cache_dir or os.path.join(user_cache_dir(), 'sounds')
+        self.wav_cache = wav_cache
+        self.volumes = {group: 1.0 for group in GROUPS}
+        self.sounds = {}  # Decoded effects
+        self.sources = {}  # Id -> file actually read, the cached WAV once it exists
+
+    def group(self, sound_id):
+        return self.entries[sound_id][1]
+
+    def ids(self, group):
+        return [sound_id for sound_id, (_, sound_group) in self.entries.items() if sound_group == group]
+
+    def _wav_path(self, path):
+        mixer = pygame.mixer.get_init()
+        if not self.wav_cache or path.lower().endswith('.wav') or not mixer or mixer[1] != -16:
+            return None
+        frequency, _, channels = mixer
+        return os.path.join(self.cache_dir, f"{file_hash(path)}_{frequency}_{channels}.wav")
+
+    def _write_wav(self, sound, wav_path):
+        """Store the samples of a decoded sound as WAV, in the mixer format so reading it back needs no conversion"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            frequency, size, channels = pygame.mixer.get_init()
+            with wave.open(wav_path + '.tmp', 'wb') as file:
+                file.setnchannels(channels)
+                file.setsampwidth(abs(size) // 8)
+                file.setframerate(frequency)
+                file.writeframes(sound.get_raw())
+            os.replace(wav_path + '.tmp', wav_path)
+        except (OSError, pygame.error) as e:
+            print(f"Could not write sound cache: {e}")
+
+    def _decode(self, sound_id, load=assets.sound):
+        path = self.entries[sound_id][0]
+        wav_path = self._wav_path(path)
+        if wav_path and os.path.exists(wav_path):
+            self.sources[sound_id] = wav_path
+            return load(wav_path)
+        sound = load(path)
+        if wav_path:
+            self._write_wav(sound, wav_path)
+        self.sources[sound_id] = path
+        return sound
+
+    def load(self):
+        """Decode every effect now, music tracks are left to load_music()"""
+        start = time.perf_counter()
+        for sound_id in self.ids('effects'):
+            try:
+                self.sounds[sound_id] = self._decode(sound_id)
+                self.sounds[sound_id].set_volume(self.volumes['effects'])
+            except (pygame.error, FileNotFoundError) as e:
+                print(f"Error loading sound {sound_id}: {e}")
+        print(f"Decoded {len(self.sounds)} sound effects in {time.perf_counter() - start:.2f}s")
+
+    def sound(self, sound_id):
+        """Decoded effect, loaded now if load() did not"""
+        sound = self.sounds.get(sound_id)
+        if sound is None:
+            sound = self.sounds[sound_id] = self._decode(sound_id)
+            sound.set_volume(self.volumes[self.group(sound_id)])
+        return sound
+
+    def load_music(self, sound_id):
+        """
+        Decode a music track from its cached WAV, or from the MP3 which is then cached, in one read either way.
+        The sound is not kept by the bank or the AssetManager, the MusicController drops the tracks it is done with.
+        """
+        return self._decode(sound_id, pygame.mixer.Sound)
+
+    def set_group_volume(self, group, volume):
+        """Apply a volume from 0 to 1 to every decoded sound of the group"""
+        self.volumes[group] = volume
+        for sound_id in self.ids(group):
+            if sound_id in self.sounds:
+                self.sounds[sound_id].set_volume(volume)
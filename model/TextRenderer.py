@@ -0,0 +1,101 @@
+# model/TextRenderer.py
+from collections import OrderedDict
+
+import pygame
+
+
+class TextRenderer:
+    """Shared font cache and LRU cache of rendered text surfaces"""
+
+    def __init__(self, max_surfaces=512, outline_width=2):
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+        self.max_surfaces = max_surfaces
+        self.outline_width = outline_width
+        self.hits = 0
+        self.misses = 0
+        self.font_misses = 0
+
+    def get_font(self, size):
+        """Return the default font at the given size, building it only once"""
+        size = int(size)
+        font = self.fonts.get(size)
+        if font is None:
+            font = pygame.font.Font(None, size)
+            self.fonts[size] = font
+            self.font_misses += 1
+        return font
+
+    def render(self, text, size, color, outline=None):
+        """
+        Return a rendered text surface from the cache.
+        When outline is a color, the text is drawn on top of four offset copies in
+        that color, and the returned surface is padded by outline_width on every side.
+        """
+        size = int(size)
+        key = (size, text, tuple(color), tuple(outline) if outline is not None else None)
+
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        font = self.get_font(size)
+        if outline is None:
+            surface = font.render(text, True, color)
+        else:
+            surface = self._render_outlined(font, text, color, outline)
+
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_surfaces:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def _render_outlined(self, font, text, color, outline):
+        border = font.render(text, True, outline)
+        main = font.render(text, True, color)
+        offset = self.outline_width
+        surface = pygame.Surface((main.get_width() + offset * 2, main.get_height() + offset * 2),
+                                 pygame.SRCALPHA)
+        for dx, dy in ((0, 0), (offset * 2, 0), (0, offset * 2), (offset * 2, offset * 2)):
+            surface.blit(border, (dx, dy))
+        surface.blit(main, (offset, offset))
+        return surface
+
+    def draw(self, screen, text, size, color, pos, outline=None):
+        """Blit cached text with its top-left corner at pos and return the touched rect"""
+        surface = self.render(text, size, color, outline)
+        x, y = pos
+        if outline is not None:
+            x -= self.outline_width
+            y -= self.outline_width
+        return screen.blit(surface, (x, y))
+
+    def draw_centered(self, screen, text, size, color, center_x, y, outline=None):
+        """Blit cached text horizontally centered on center_x and return the touched rect"""
+        width = self.size(text, size)[0]
+        return self.draw(screen, text, size, color, (center_x - width // 2, y), outline)
+
+    def size(self, text, size):
+        """Size of the text without any outline padding"""
+        return self.get_font(size).size(text)
+
+    def clear(self):
+        self.surfaces.clear()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'cached_surfaces': len(self.surfaces),
+            'cached_fonts': len(self.fonts),
+            'font_misses': self.font_misses,
+        }
+
+
+# Shared instance used by every draw path
+text_renderer = TextRenderer()
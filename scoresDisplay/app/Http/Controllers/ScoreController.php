@@ -11,16 +11,25 @@ use Illuminate\Support\Facades\Validator;
 class ScoreController extends Controller
 {
 
-    public function getGameScores()
+    public function getGameScores(Request $request)
     {
         $scores = GameScore::orderBy('score', 'desc')->limit(10)->get();
-        return response()->json($scores);
+        return $this->leaderboard($request, $scores);
     }
 
-    public function getCliScores()
+    public function getCliScores(Request $request)
     {
         $scores = CliScores::orderBy('score', 'desc')->limit(10)->get();
-        return response()->json($scores);
+        return $this->leaderboard($request, $scores);
+    }
+
+    // Leaderboard with an ETag, a client already holding it gets an empty 304
+    private function leaderboard(Request $request, $scores)
+    {
+        $response = response()->json($scores);
+        $response->setEtag(md5($response->getContent()));
+        $response->isNotModified($request);
+        return $response;
     }
 
     public function storeGameScore(Request $request)
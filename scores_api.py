@@ -1,36 +1,300 @@
 # scores_api.py
 import requests
 import json
+import math
 import time
 import logging
 import os
+import threading
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from requests.adapters import HTTPAdapter
 
 # Set up logging
 logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger('ScoreAPI')
 
+DEFAULT_BASE_URL = "https://keyscale.lzonca.fr/api"
+LATENCY_SAMPLES = 200  # Most recent request latencies kept for the stats
+# Scores waiting to be sent, one file per entry point as the lock only covers one process
+OUTBOX_PATH = os.environ.get('KEYSCALE_OUTBOX', 'score_outbox.jsonl')
+CLI_OUTBOX_PATH = os.environ.get('KEYSCALE_CLI_OUTBOX', os.path.join('CLI', 'score_outbox.jsonl'))
+SYNC_BATCH_SIZE = 50
+SYNC_CONCURRENCY = 8
+# Last leaderboards fetched, shown at once and refreshed in the background once older than the TTL
+LEADERBOARD_CACHE_PATH = os.environ.get('KEYSCALE_LEADERBOARD_CACHE', 'leaderboard_cache.json')
+LEADERBOARD_TTL = float(os.environ.get('KEYSCALE_LEADERBOARD_TTL', '60'))  # Seconds
+
+
+class HttpClient:
+    """
+    One requests.Session for the whole process, its pooled adapter keeps connections alive,
+    so every round trip to the leaderboard after the first skips the TCP and TLS handshakes.
+    Counts requests, their latency and how many reused an open connection.
+    """
+
+    def __init__(self, pool_connections=4, pool_maxsize=16):
+        self.session = requests.Session()
+        self.adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount('https://', self.adapter)
+        self.session.mount('http://', self.adapter)
+        self.session.headers.update({
+            'Accept': 'application/json',
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive',
+        })
+        self.lock = threading.Lock()
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+        self.requests = 0
+        self.failures = 0
+
+    def request(self, method, url, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self.session.request(method, url, **kwargs)
+        except requests.exceptions.RequestException:
+            with self.lock:
+                self.failures += 1
+            raise
+        finally:
+            with self.lock:
+                self.requests += 1
+                self.latencies.append(time.perf_counter() - start)
+
+    def _connection_counts(self):
+        """(connections opened, requests sent) over the connection pools still open"""
+        pools = self.adapter.poolmanager.pools
+        opened = sent = 0
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is not None:
+                opened += pool.num_connections
+                sent += pool.num_requests
+        return opened, sent
+
+    def stats(self):
+        with self.lock:
+            latencies = sorted(self.latencies)
+            last = self.latencies[-1] if self.latencies else None
+            requests_made, failures = self.requests, self.failures
+        opened, sent = self._connection_counts()
+        stats = {
+            'requests': requests_made,
+            'failures': failures,
+            'connections_opened': opened,
+            'connections_reused': max(0, sent - opened),
+        }
+        if latencies:
+            stats.update({
+                'last_ms': last * 1000,
+                'median_ms': latencies[len(latencies) // 2] * 1000,
+                'p95_ms': latencies[max(0, math.ceil(len(latencies) * 0.95) - 1)] * 1000,
+                'max_ms': latencies[-1] * 1000,
+            })
+        return stats
+
+    def close(self):
+        self.session.close()
+
+
+class ScoreOutbox:
+    """
+    Durable queue of the scores not delivered yet, kept apart from the local leaderboards.
+    The file is append-only JSON lines: an 'add' record per score with its idempotency key, a 'done'
+    record once the server took it (or refused it for good). A crash can at worst cut the last line,
+    which is skipped, and a score sent but not marked done is sent again with the same key. The leaderboard
+    server does not read that key yet, such a resend can store the score twice.
+    """
+
+    def __init__(self, path=OUTBOX_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+
+    def _append(self, record):
+        line = (json.dumps(record) + '\n').encode()
+        with self.lock:
+            with open(self.path, 'ab+') as file:
+                if file.tell():
+                    file.seek(-1, os.SEEK_END)
+                    if file.read(1) != b'\n':
+                        line = b'\n' + line  # Last line cut by a crash, keep it apart from this one
+                file.write(line)
+                file.flush()
+                os.fsync(file.fileno())
+
+    def _records(self):
+        try:
+            with open(self.path, 'r') as file:
+                lines = file.readlines()
+        except FileNotFoundError:
+            return []
+        records = []
+        for line in lines:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping damaged outbox line in {self.path}")
+        return records
+
+    def add(self, kind, data, key=None):
+        """Queue a score ('game' or 'cli'), returning its idempotency key"""
+        key = key or str(uuid.uuid4())
+        self._append({'op': 'add', 'key': key, 'kind': kind, 'data': data, 'created': time.time()})
+        return key
+
+    def mark_done(self, key, status='sent'):
+        self._append({'op': 'done', 'key': key, 'status': status})
+
+    def pending(self):
+        """Scores still to send, oldest first"""
+        with self.lock:
+            return self._pending()
+
+    def _pending(self):
+        records = self._records()
+        done = {record['key'] for record in records if record.get('op') == 'done'}
+        pending = {}
+        for record in records:
+            if record.get('op') == 'add' and record['key'] not in done:
+                pending.setdefault(record['key'], record)
+        return list(pending.values())
+
+    def compact(self):
+        """Rewrite the file with the pending scores only"""
+        with self.lock:
+            pending = self._pending()
+            if not pending:
+                if os.path.exists(self.path):
+                    os.remove(self.path)
+                return
+            with open(self.path + '.tmp', 'w') as file:
+                for record in pending:
+                    file.write(json.dumps(record) + '\n')
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(self.path + '.tmp', self.path)
+
+
+class LeaderboardCache:
+    """
+    Last leaderboard of each kind ('game' or 'cli') with its ETag and the time it was fetched, in one JSON file.
+    Read once when created, rewritten atomically on every change without touching the other kinds,
+    which the game and the CLI may update from their own processes.
+    """
+
+    def __init__(self, path=LEADERBOARD_CACHE_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.entries = self._read()
+
+    def _read(self):
+        try:
+            with open(self.path, 'r') as file:
+                entries = json.load(file)
+            return entries if isinstance(entries, dict) else {}
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _write(self, kind):
+        entries = self._read()
+        entries[kind] = self.entries[kind]
+        try:
+            with open(self.path + '.tmp', 'w') as file:
+                json.dump(entries, file)
+            os.replace(self.path + '.tmp', self.path)
+        except OSError as e:
+            logger.warning(f"Could not write leaderboard cache {self.path}: {e}")
+
+    def get(self, kind):
+        with self.lock:
+            return self.entries.get(kind)
+
+    def put(self, kind, scores, etag=None):
+        with self.lock:
+            self.entries[kind] = {'scores': scores, 'etag': etag, 'fetched': time.time()}
+            self._write(kind)
+
+    def touch(self, kind):
+        """The server confirmed the cached leaderboard is still current"""
+        with self.lock:
+            if kind in self.entries:
+                self.entries[kind]['fetched'] = time.time()
+                self.entries[kind].pop('expired', None)
+                self._write(kind)
+
+    def expire(self, kind):
+        """Keep the leaderboard but have the next read revalidate it"""
+        with self.lock:
+            if kind in self.entries:
+                self.entries[kind]['expired'] = True
+                self._write(kind)
+
+    def age(self, kind):
+        """Seconds since the leaderboard was fetched or confirmed, None when there is none"""
+        entry = self.get(kind)
+        return None if entry is None else max(0.0, time.time() - entry['fetched'])
+
+    def stale(self, kind, ttl):
+        """True when the leaderboard is older than ttl, expired or missing"""
+        entry = self.get(kind)
+        return entry is None or entry.get('expired', False) or time.time() - entry['fetched'] > ttl
+
+
+_client = None
+_apis = {}
+_client_lock = threading.Lock()
+
+
+def get_http_client():
+    """Process-wide HTTP client, created on first use"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
+
+
+def get_score_api(base_url=DEFAULT_BASE_URL, outbox_path=OUTBOX_PATH):
+    """Process-wide ScoreAPI for base_url and outbox, they all share the HTTP client"""
+    with _client_lock:
+        api = _apis.get((base_url, outbox_path))
+    if api is None:
+        api = ScoreAPI(base_url, outbox=ScoreOutbox(outbox_path))
+        with _client_lock:
+            api = _apis.setdefault((base_url, outbox_path), api)
+    return api
+
 
 class ScoreAPI:
-    def __init__(self, base_url="https://keyscale.lzonca.fr/api", max_retries=3, retry_delay=1):
+    def __init__(self, base_url=DEFAULT_BASE_URL, max_retries=3, retry_delay=1, client=None, outbox=None, timeout=10,
+                 cache=None, ttl=LEADERBOARD_TTL):
         self.base_url = base_url
         self.max_retries = max_retries
         self.retry_delay = retry_delay
+        self.client = client or get_http_client()
+        self.outbox = outbox or ScoreOutbox()
+        self.timeout = timeout  # Seconds, for each attempt
+        self.cache = cache or LeaderboardCache()
+        self.ttl = ttl
+        self.revalidations = {}  # Kind -> thread revalidating its cached leaderboard
+        self.revalidation_lock = threading.Lock()
         logger.info(f"ScoreAPI initialized with base URL: {self.base_url}")
 
-    def _make_api_request(self, method, endpoint, data=None, retries=0):
+    def _make_api_request(self, method, endpoint, data=None, retries=0, headers=None, max_retries=None):
         """
         Make API request with retry logic
         """
         url = f"{self.base_url}/{endpoint}"
+        max_retries = self.max_retries if max_retries is None else max_retries
 
         try:
-            headers = {'Content-Type': 'application/json', 'Accept': 'application/json'}
-
             if method.lower() == 'get':
-                response = requests.get(url, headers=headers, timeout=10)
+                response = self.client.request('GET', url, headers=headers, timeout=self.timeout)
             elif method.lower() == 'post':
-                response = requests.post(url, json=data, headers=headers, timeout=10)
+                response = self.client.request('POST', url, json=data, headers=headers, timeout=self.timeout)
             else:
                 raise ValueError(f"Unsupported HTTP method: {method}")
 
@@ -38,38 +302,103 @@ class ScoreAPI:
             return response
 
         except requests.exceptions.RequestException as e:
-            if retries < self.max_retries:
+            if _is_rejection(e):
+                # The server refused the data itself, sending it again cannot help
+                raise
+            if retries < max_retries:
                 logger.warning(
-                    f"Request failed ({e}). Retrying in {self.retry_delay}s... ({retries + 1}/{self.max_retries})")
+                    f"Request failed ({e}). Retrying in {self.retry_delay}s... ({retries + 1}/{max_retries})")
                 time.sleep(self.retry_delay)
-                return self._make_api_request(method, endpoint, data, retries + 1)
+                return self._make_api_request(method, endpoint, data, retries + 1, headers, max_retries)
             else:
-                logger.error(f"API request failed after {self.max_retries} retries: {e}")
+                logger.error(f"API request failed after {max_retries} retries: {e}")
                 raise
 
-    def get_cli_scores(self):
+    def stats(self):
+        """Latency and connection reuse of the shared HTTP client"""
+        return self.client.stats()
+
+    def get_cli_scores(self, on_update=None):
         """
-        Get CLI scores from API
+        Get CLI scores, from the cache when there is one
         """
-        try:
-            response = self._make_api_request('get', 'scores/cli')
-            return response.json()
-        except Exception as e:
-            logger.error(f"Failed to get CLI scores: {e}")
-            # Fallback to local JSON
-            return self._load_local_json(True)
+        return self._get_scores('cli', on_update)
+
+    def get_game_scores(self, on_update=None):
+        """
+        Get game scores, from the cache when there is one
+        """
+        return self._get_scores('game', on_update)
+
+    def _get_scores(self, kind, on_update=None):
+        """
+        Cached leaderboard right away, revalidated in the background once older than the TTL. on_update(scores, fresh)
+        then gets the current one, or the cached one with fresh False when the server could not be reached.
+        Only the very first read waits on the network, falling back to the local JSON.
+        """
+        entry = self.cache.get(kind)
+        if entry is None:
+            try:
+                return self.revalidate(kind)
+            except Exception as e:
+                logger.error(f"Failed to get {kind} scores: {e}")
+                # Fallback to local JSON
+                return self._load_local_json(kind == 'cli')
+        if self.cache.stale(kind, self.ttl):
+            self._revalidate_in_background(kind, on_update)
+        return entry['scores']
 
-    def get_game_scores(self):
+    def revalidate(self, kind):
         """
-        Get game scores from API
+        Fetch the leaderboard now and cache it. The request carries the cached ETag, so an unchanged
+        leaderboard costs an empty 304 answer.
         """
+        entry = self.cache.get(kind)
+        headers = {'If-None-Match': entry['etag']} if entry and entry.get('etag') else None
+        response = self._make_api_request('get', f'scores/{kind}', headers=headers)
+        if response.status_code == 304 and entry is not None:
+            self.cache.touch(kind)
+            return entry['scores']
+        scores = response.json()
+        self.cache.put(kind, scores, response.headers.get('ETag'))
+        return scores
+
+    def _revalidate_in_background(self, kind, on_update):
+        with self.revalidation_lock:
+            thread = self.revalidations.get(kind)
+            if thread is not None and thread.is_alive():
+                return
+            thread = threading.Thread(target=self._revalidate_job, args=(kind, on_update), daemon=True)
+            self.revalidations[kind] = thread
+        thread.start()
+
+    def _revalidate_job(self, kind, on_update):
         try:
-            response = self._make_api_request('get', 'scores/game')
-            return response.json()
+            scores = self.revalidate(kind)
         except Exception as e:
-            logger.error(f"Failed to get game scores: {e}")
-            # Fallback to local JSON
-            return self._load_local_json(False)
+            logger.warning(f"Could not revalidate {kind} scores, keeping the cached ones: {e}")
+            if on_update is not None:
+                on_update(self.cache.get(kind)['scores'], False)
+            return
+        if on_update is not None:
+            on_update(scores, True)
+
+    def wait_for_revalidation(self, kind, timeout=None):
+        """Block until the background revalidation of the leaderboard, if any, is done"""
+        with self.revalidation_lock:
+            thread = self.revalidations.get(kind)
+        if thread is not None:
+            thread.join(timeout)
+
+    def leaderboard_status(self, kind):
+        """Age in seconds of the cached leaderboard (None without one), whether it is stale and being revalidated"""
+        with self.revalidation_lock:
+            thread = self.revalidations.get(kind)
+        return {
+            'age': self.cache.age(kind),
+            'stale': self.cache.stale(kind, self.ttl),
+            'revalidating': thread is not None and thread.is_alive(),
+        }
 
     def save_cli_score(self, name, score, letters=0, avg_time=0):
         """
@@ -82,15 +411,7 @@ class ScoreAPI:
             "avg_time": avg_time
         }
 
-        try:
-            response = self._make_api_request('post', 'scores/cli', data)
-            logger.info(f"CLI score saved to API for {name}: {score} points")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to save CLI score to API: {e}")
-            # Fallback to local JSON
-            self._save_to_local_json(data, is_cli=True)
-            return False
+        return self._save_score('cli', data)
 
     def save_game_score(self, name, score, difficulty="normal"):
         """
@@ -102,16 +423,73 @@ class ScoreAPI:
             "difficulty": difficulty
         }
 
+        return self._save_score('game', data)
+
+    def _save_score(self, kind, data, key=None):
+        """
+        POST a score with its idempotency key, queueing it in the outbox when it could not be delivered.
+        The same key goes with every later attempt, a server reading it can recognise a score it already has
+        (the current one does not, a lost answer followed by a resend stores the score twice).
+        """
+        key = key or str(uuid.uuid4())
         try:
-            response = self._make_api_request('post', 'scores/game', data)
-            logger.info(f"Game score saved to API for {name}: {score} points")
+            self._make_api_request('post', f'scores/{kind}', data, headers={'Idempotency-Key': key})
+            self.cache.expire(kind)
+            logger.info(f"{kind.upper()} score saved to API for {data['name']}: {data['score']} points")
             return True
         except Exception as e:
-            logger.error(f"Failed to save game score to API: {e}")
-            # Fallback to local JSON
-            self._save_to_local_json(data, is_cli=False)
+            logger.error(f"Failed to save {kind} score to API: {e}")
+            if _is_rejection(e):
+                return False
+            self.outbox.add(kind, data, key)
+            logger.info(f"Score queued in {self.outbox.path}, it will be sent by the next sync")
             return False
 
+    def _send_pending(self, record, deadline=None):
+        """Send one outbox entry, returning 'sent', 'rejected', 'failed' or 'deferred' once past the deadline"""
+        if deadline is not None and time.monotonic() > deadline:
+            return 'deferred'
+        try:
+            self._make_api_request('post', f"scores/{record['kind']}", record['data'],
+                                   headers={'Idempotency-Key': record['key']}, max_retries=1)
+        except Exception as e:
+            if not _is_rejection(e):
+                return 'failed'
+            logger.error(f"Score {record['key']} refused by the server, dropped: {e}")
+            self.outbox.mark_done(record['key'], 'rejected')
+            return 'rejected'
+        self.outbox.mark_done(record['key'])
+        self.cache.expire(record['kind'])
+        return 'sent'
+
+    def sync_local_scores(self, batch_size=SYNC_BATCH_SIZE, concurrency=SYNC_CONCURRENCY, time_budget=None):
+        """
+        Send the scores waiting in the outbox, batch_size at a time with up to concurrency requests in flight.
+        Every delivered score is marked done at once, so an interrupted sync resumes where it stopped.
+        Stops at the first batch where nothing went through, the server being unreachable, and starts no new
+        request after time_budget seconds, the rest waiting for the next sync.
+        """
+        results = {'sent': 0, 'rejected': 0, 'failed': 0, 'deferred': 0}
+        pending = self.outbox.pending()
+        deadline = None if time_budget is None else time.monotonic() + time_budget
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for start in range(0, len(pending), batch_size):
+                batch = pending[start:start + batch_size]
+                outcomes = list(executor.map(lambda record: self._send_pending(record, deadline), batch))
+                for outcome in outcomes:
+                    results[outcome] += 1
+                left = len(pending) - start - len(batch)
+                if all(outcome == 'failed' for outcome in outcomes):
+                    results['failed'] += left
+                    break
+                if 'deferred' in outcomes:
+                    results['deferred'] += left
+                    break
+        self.outbox.compact()
+        results['remaining'] = len(self.outbox.pending())
+        logger.info(f"Sync done: {results}")
+        return results
+
     def _load_local_json(self, is_cli=True):
         """
         Load scores from local JSON file
@@ -125,39 +503,8 @@ class ScoreAPI:
             logger.warning(f"Failed to load local scores from {file_path}: {e}")
             return []
 
-    def _save_to_local_json(self, score_data, is_cli=True):
-        """
-        Fallback method to save scores locally if API is unavailable
-        """
-        file_path = "CLI/scores_CLI.json" if is_cli else "scores.json"
 
-        # Ensure directory exists
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-
-        try:
-            # Load existing scores
-            scores = []
-            try:
-                with open(file_path, 'r') as file:
-                    scores = json.load(file)
-            except (FileNotFoundError, json.JSONDecodeError):
-                scores = []
-
-            # Add new score
-            scores.append(score_data)
-
-            # Sort by score (descending)
-            scores.sort(key=lambda x: x.get('score', 0), reverse=True)
-
-            # Keep only top 10 scores
-            scores = scores[:10]
-
-            # Save back to file
-            with open(file_path, 'w') as file:
-                json.dump(scores, file, indent=4)
-
-            logger.info(f"Score saved locally to {file_path}")
-            return True
-        except Exception as e:
-            logger.error(f"Error saving score locally: {e}")
-            return False
\ No newline at end of file
+def _is_rejection(error):
+    """True for a 4XX answer, the request itself is wrong (except timeouts and rate limiting)"""
+    response = getattr(error, 'response', None)
+    return response is not None and 400 <= response.status_code < 500 and response.status_code not in (408, 429)